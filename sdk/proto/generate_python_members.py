@@ -0,0 +1,79 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Writes the table of the names that the Python SDK's `pulumi.runtime.proto` package lazily imports from each of its
+generated modules. Run by generate.sh once the modules have been generated, with the package's directory as its only
+argument.
+"""
+
+import importlib
+import os
+import sys
+import textwrap
+import types
+
+# The generated modules that the package makes available, in the same order as its `import *` fallback.
+MODULES = ["analyzer", "engine", "language", "plugin", "provider", "resource"]
+
+HEADER = '''\
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generated by sdk/proto/generate.sh from the generated modules. DO NOT EDIT.
+
+# The generated modules, along with the names of the messages, enums, stubs and servicers that each of them makes
+# available from this package.
+MODULE_MEMBERS = {
+'''
+
+
+def public_members(module: types.ModuleType):
+    return [name for name in dir(module) if not name.startswith("_") and name != "DESCRIPTOR" and
+            not isinstance(getattr(module, name), types.ModuleType)]
+
+
+def main(package_dir: str):
+    # Import the generated modules as part of a bare package, so that neither the package's own __init__ nor the rest
+    # of the SDK is needed.
+    package = types.ModuleType("proto")
+    package.__path__ = [package_dir]  # type: ignore
+    sys.modules["proto"] = package
+
+    lines = [HEADER]
+    for module_name in [f"{name}_pb2{suffix}" for name in MODULES for suffix in ["", "_grpc"]]:
+        names = ", ".join(f'"{name}"' for name in public_members(importlib.import_module(f"proto.{module_name}")))
+        lines.append(f'    "{module_name}": [\n')
+        for line in textwrap.wrap(names, width=112, break_long_words=False, break_on_hyphens=False):
+            lines.append(f"        {line}\n")
+        lines.append("    ],\n")
+    lines.append("}\n")
+
+    with open(os.path.join(package_dir, "_members.py"), "w") as f:
+        f.write("".join(lines))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -18,6 +18,8 @@ providers and libraries in the Pulumi ecosystem use to create and manage
 resources.
 """
 
+import sys
+
 # Make subpackages available.
 __all__ = ['runtime', 'dynamic']
 
@@ -82,6 +84,15 @@ from .log import (
     error,
 )
 
-from .stack_reference import (
-    StackReference,
-)
+# Members of modules that most programs never use are imported the first time they're asked for.
+_LAZY_MEMBERS = {
+    "StackReference": ".stack_reference",
+}
+
+if sys.version_info >= (3, 7):
+    from .runtime.lazy import lazy_getattr as _lazy_getattr
+    __getattr__ = _lazy_getattr(__name__, globals(), _LAZY_MEMBERS)
+else:
+    from .stack_reference import (
+        StackReference,
+    )
@@ -16,13 +16,26 @@
 The config module contains all configuration management functionality.
 """
 import json
-from typing import Optional, Any
+from typing import Optional, Any, Callable, Dict, Tuple
 
 from . import errors
 from .output import Output
 from .runtime.config import get_config
 from .metadata import get_project
 
+_typed_values: Dict[Tuple[str, str], Tuple[str, Any]] = {}
+"""
+Configuration values that have been converted to other types, keyed by the type and the full configuration key, along
+with the string they were converted from.
+"""
+
+def _parse_bool(v: str) -> bool:
+    if v in ['true', 'True']:
+        return True
+    if v in ['false', 'False']:
+        return False
+    raise ValueError(v)
+
 class Config:
     """
     Config is a bag of related configuration state.  Each bag contains any number of configuration variables, indexed by
@@ -82,14 +95,7 @@ class Config:
         :rtype: Optional[bool]
         :raises ConfigTypeError: The configuration value existed but couldn't be coerced to bool.
         """
-        v = self.get(key)
-        if v is None:
-            return None
-        if v in ['true', 'True']:
-            return True
-        if v in ['false', 'False']:
-            return False
-        raise ConfigTypeError(self.full_key(key), v, 'bool')
+        return self._get_typed(key, 'bool', _parse_bool)
 
     def get_secret_bool(self, key: str) -> Optional[Output[bool]]:
         """
@@ -117,13 +123,7 @@ class Config:
         :rtype: Optional[int]
         :raises ConfigTypeError: The configuration value existed but couldn't be coerced to int.
         """
-        v = self.get(key)
-        if v is None:
-            return None
-        try:
-            return int(v)
-        except:
-            raise ConfigTypeError(self.full_key(key), v, 'int')
+        return self._get_typed(key, 'int', int)
 
     def get_secret_int(self, key: str) -> Optional[Output[int]]:
         """
@@ -151,13 +151,7 @@ class Config:
         :rtype: Optional[float]
         :raises ConfigTypeError: The configuration value existed but couldn't be coerced to float.
         """
-        v = self.get(key)
-        if v is None:
-            return None
-        try:
-            return float(v)
-        except:
-            raise ConfigTypeError(self.full_key(key), v, 'float')
+        return self._get_typed(key, 'float', float)
 
     def get_secret_float(self, key: str) -> Optional[Output[float]]:
         """
@@ -181,13 +175,7 @@ class Config:
         doesn't exist. This routine simply JSON parses and doesn't validate the shape of the
         contents.
         """
-        v = self.get(key)
-        if v is None:
-            return None
-        try:
-            return json.loads(v)
-        except:
-            raise ConfigTypeError(self.full_key(key), v, "JSON object")
+        return self._get_typed(key, "JSON object", json.loads)
 
     def get_secret_object(self, key: str) -> Optional[Output[Any]]:
         """
@@ -331,6 +319,27 @@ class Config:
         """
         return Output.secret(self.require_object(key))
 
+    def _get_typed(self, key: str, expect_type: str, convert: Callable[[str], Any]) -> Optional[Any]:
+        """
+        Returns a configuration value converted to another type, or None if it doesn't exist. Converted values are
+        remembered so that reading the same value repeatedly doesn't convert it each time. Lists and dicts are
+        converted afresh for each caller instead, so that callers that change them don't affect one another.
+        """
+        v = self.get(key)
+        if v is None:
+            return None
+        full_key = self.full_key(key)
+        cached = _typed_values.get((expect_type, full_key))
+        if cached is not None and cached[0] == v:
+            return cached[1]
+        try:
+            value = convert(v)
+        except:
+            raise ConfigTypeError(full_key, v, expect_type)
+        if not isinstance(value, (dict, list)):
+            _typed_values[(expect_type, full_key)] = (v, value)
+        return value
+
     def full_key(self, key: str) -> str:
         """
         Turns a simple configuration key into a fully resolved one, by prepending the bag's name.
@@ -26,4 +26,5 @@ from .dynamic import (
     UpdateResult,
     Resource,
     ResourceProvider,
+    AsyncResourceProvider,
 )
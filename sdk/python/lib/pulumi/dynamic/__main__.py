@@ -14,48 +14,116 @@
 
 import asyncio
 import base64
+import collections
 from concurrent import futures
+import functools
+import hashlib
+import inspect
+import os
 import sys
+import threading
 import time
 
 import dill
 import grpc
+try:
+    from grpc import aio as grpc_aio
+except ImportError:
+    grpc_aio = None
 from google.protobuf import empty_pb2
 from pulumi.runtime import proto, rpc
-from pulumi.runtime.proto import provider_pb2_grpc, ResourceProviderServicer
+from pulumi.runtime.settings import _rpc_parallelism
+from pulumi.runtime.proto import provider_pb2_grpc
 from pulumi.dynamic import ResourceProvider
+from pulumi.dynamic.dynamic import _load_provider
 
 _ONE_DAY_IN_SECONDS = 60 * 60 * 24
 PROVIDER_KEY = "__provider"
 
+_MAX_CACHED_PROVIDERS = 64
+"""
+The most unpickled providers that are kept around at once.
+"""
+
+_providers: 'collections.OrderedDict[str, ResourceProvider]' = collections.OrderedDict()
+_providers_lock = threading.Lock()
+
+# Run the methods of synchronous providers on as many threads as the engine may send us requests, using the same sizing
+# as the runtime's RPCs.
+_executor = futures.ThreadPoolExecutor(max_workers=_rpc_parallelism(os.getenv("PULUMI_PARALLEL")))
+
 def get_provider(props) -> ResourceProvider:
-    byts = base64.b64decode(props[PROVIDER_KEY])
-    return dill.loads(byts)
+    # Every resource of a dynamic provider carries the same pickled provider (or the same digest of it), so each one is
+    # only loaded and unpickled once. The cache is keyed on a hash of the pickled provider rather than on the pickled
+    # provider itself, which can be large.
+    #
+    # The unpickled provider is shared: every request for the resources that carry it gets the same instance, and
+    # requests run concurrently, on the executor's threads and on the event loop. Any state a provider keeps on itself
+    # is therefore shared across those requests, and it's up to the provider to guard it.
+    serialized = props[PROVIDER_KEY]
+    key = hashlib.sha256(serialized.encode()).hexdigest()
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is not None:
+            _providers.move_to_end(key)
+            return provider
+
+    # Two requests may unpickle the same provider at once; the first one to finish is the one that's kept and shared.
+    provider = dill.loads(base64.b64decode(_load_provider(serialized)))
+    with _providers_lock:
+        provider = _providers.setdefault(key, provider)
+        _providers.move_to_end(key)
+        while len(_providers) > _MAX_CACHED_PROVIDERS:
+            _providers.popitem(last=False)
+    return provider
+
+async def call_provider(method, *args):
+    # Providers may implement their methods as coroutines, which run on the event loop alongside every other request.
+    # Synchronous methods run on the executor instead, so that they don't hold up the event loop while they work.
+    if inspect.iscoroutinefunction(method):
+        return await method(*args)
+    result = await asyncio.get_event_loop().run_in_executor(_executor, functools.partial(method, *args))
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+# The servicer's methods are coroutines, so it doesn't derive from the generated ResourceProviderServicer, whose methods
+# are synchronous. It implements every method that add_ResourceProviderServicer_to_server registers instead.
+class DynamicResourceProviderServicer:
+    # pylint: disable=unused-argument
+    async def GetSchema(self, request, context):
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("GetSchema is not implemented by the dynamic provider")
+        raise NotImplementedError("GetSchema is not implemented by the dynamic provider")
 
-class DynamicResourceProviderServicer(ResourceProviderServicer):
-    def CheckConfig(self, request, context):
+    async def CheckConfig(self, request, context):
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details("CheckConfig is not implemented by the dynamic provider")
         raise NotImplementedError("CheckConfig is not implemented by the dynamic provider")
 
-    def DiffConfig(self, request, context):
+    async def DiffConfig(self, request, context):
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details("DiffConfig is not implemented by the dynamic provider")
         raise NotImplementedError("DiffConfig is not implemented by the dynamic provider")
 
-    def Invoke(self, request, context):
+    async def Invoke(self, request, context):
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details("Invoke is not implemented by the dynamic provider")
         raise NotImplementedError("unknown function %s" % request.token)
 
-    def Diff(self, request, context):
+    async def StreamInvoke(self, request, context):
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("StreamInvoke is not implemented by the dynamic provider")
+        raise NotImplementedError("StreamInvoke is not implemented by the dynamic provider")
+
+    async def Diff(self, request, context):
         olds = rpc.deserialize_properties(request.olds, True)
         news = rpc.deserialize_properties(request.news, True)
         if news[PROVIDER_KEY] == rpc.UNKNOWN:
             provider = get_provider(olds)
         else:
             provider = get_provider(news)
-        result = provider.diff(request.id, olds, news)
+        result = await call_provider(provider.diff, request.id, olds, news)
         fields = {}
         if result.changes is not None:
             if result.changes:
@@ -70,49 +138,45 @@ class DynamicResourceProviderServicer(ResourceProviderServicer):
             fields["deleteBeforeReplace"] = result.delete_before_replace
         return proto.DiffResponse(**fields)
 
-    def Update(self, request, context):
+    async def Update(self, request, context):
         olds = rpc.deserialize_properties(request.olds)
         news = rpc.deserialize_properties(request.news)
         provider = get_provider(news)
 
-        result = provider.update(request.id, olds, news)
+        result = await call_provider(provider.update, request.id, olds, news)
         outs = {}
         if result.outs is not None:
             outs = result.outs
         outs[PROVIDER_KEY] = news[PROVIDER_KEY]
 
-        loop = asyncio.new_event_loop()
-        outs_proto = loop.run_until_complete(rpc.serialize_properties(outs, {}))
-        loop.close()
+        outs_proto = await rpc.serialize_properties(outs, {})
 
         fields = {"properties": outs_proto}
         return proto.UpdateResponse(**fields)
 
-    def Delete(self, request, context):
+    async def Delete(self, request, context):
         id_ = request.id
         props = rpc.deserialize_properties(request.properties)
         provider = get_provider(props)
-        provider.delete(id_, props)
+        await call_provider(provider.delete, id_, props)
         return empty_pb2.Empty()
 
-    def Cancel(self, request, context):
+    async def Cancel(self, request, context):
         return empty_pb2.Empty()
 
-    def Create(self, request, context):
+    async def Create(self, request, context):
         props = rpc.deserialize_properties(request.properties)
         provider = get_provider(props)
-        result = provider.create(props)
+        result = await call_provider(provider.create, props)
         outs = result.outs
         outs[PROVIDER_KEY] = props[PROVIDER_KEY]
 
-        loop = asyncio.new_event_loop()
-        outs_proto = loop.run_until_complete(rpc.serialize_properties(outs, {}))
-        loop.close()
+        outs_proto = await rpc.serialize_properties(outs, {})
 
         fields = {"id": result.id, "properties": outs_proto}
         return proto.CreateResponse(**fields)
 
-    def Check(self, request, context):
+    async def Check(self, request, context):
         olds = rpc.deserialize_properties(request.olds, True)
         news = rpc.deserialize_properties(request.news, True)
         if news[PROVIDER_KEY] == rpc.UNKNOWN:
@@ -120,40 +184,36 @@ class DynamicResourceProviderServicer(ResourceProviderServicer):
         else:
             provider = get_provider(news)
 
-        result = provider.check(olds, news)
+        result = await call_provider(provider.check, olds, news)
         inputs = result.inputs
         failures = result.failures
 
         inputs[PROVIDER_KEY] = news[PROVIDER_KEY]
 
-        loop = asyncio.new_event_loop()
-        inputs_proto = loop.run_until_complete(rpc.serialize_properties(inputs, {}))
-        loop.close()
+        inputs_proto = await rpc.serialize_properties(inputs, {})
 
         failures_proto = [proto.CheckFailure(f.property, f.reason) for f in failures]
 
         fields = {"inputs": inputs_proto, "failures": failures_proto}
         return proto.CheckResponse(**fields)
 
-    def Configure(self, request, context):
+    async def Configure(self, request, context):
         fields = {"acceptSecrets": False}
         return proto.ConfigureResponse(**fields)
 
-    def GetPluginInfo(self, request, context):
+    async def GetPluginInfo(self, request, context):
         fields = {"version": "0.1.0"}
         return proto.PluginInfo(**fields)
 
-    def Read(self, request, context):
+    async def Read(self, request, context):
         id_ = request.id
         props = rpc.deserialize_properties(request.properties)
         provider = get_provider(props)
-        result = provider.read(id_, props)
+        result = await call_provider(provider.read, id_, props)
         outs = result.outs
         outs[PROVIDER_KEY] = props[PROVIDER_KEY]
 
-        loop = asyncio.new_event_loop()
-        outs_proto = loop.run_until_complete(rpc.serialize_properties(outs, {}))
-        loop.close()
+        outs_proto = await rpc.serialize_properties(outs, {})
 
         fields = {"id": result.id, "properties": outs_proto}
         return proto.ReadResponse(**fields)
@@ -161,10 +221,48 @@ class DynamicResourceProviderServicer(ResourceProviderServicer):
     def __init__(self):
         pass
 
+class _BlockingServicer:
+    """
+    Adapts the servicer for gRPC servers that call it from their own worker threads, by running each request on an
+    event loop that's shared by every worker.
+    """
+    def __init__(self, servicer, loop):
+        self._servicer = servicer
+        self._loop = loop
+
+    def __getattr__(self, name):
+        method = getattr(self._servicer, name)
+        if not inspect.iscoroutinefunction(method):
+            return method
+
+        def call(request, context):
+            return asyncio.run_coroutine_threadsafe(method(request, context), self._loop).result()
+        return call
+
 def main():
     monitor = DynamicResourceProviderServicer()
-    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
-    provider_pb2_grpc.add_ResourceProviderServicer_to_server(monitor, server)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+
+    if grpc_aio is not None:
+        # Serve every request on the event loop, so that requests to providers with coroutine methods don't need a
+        # thread each.
+        aio_server = grpc_aio.server(migration_thread_pool=_executor)
+        provider_pb2_grpc.add_ResourceProviderServicer_to_server(monitor, aio_server)
+        port = aio_server.add_insecure_port(address="0.0.0.0:0")
+        loop.run_until_complete(aio_server.start())
+        sys.stdout.buffer.write(f"{port}\n".encode())
+        try:
+            loop.run_until_complete(aio_server.wait_for_termination())
+        except KeyboardInterrupt:
+            loop.run_until_complete(aio_server.stop(0))
+        return
+
+    # Older versions of gRPC don't have an asyncio server, so requests are served from worker threads that hand them to
+    # the event loop running in the background.
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=_rpc_parallelism(os.getenv("PULUMI_PARALLEL"))))
+    provider_pb2_grpc.add_ResourceProviderServicer_to_server(_BlockingServicer(monitor, loop), server)
     port = server.add_insecure_port(address="0.0.0.0:0")
     server.start()
     sys.stdout.buffer.write(f"{port}\n".encode())
@@ -174,4 +272,5 @@ def main():
     except KeyboardInterrupt:
         server.stop(0)
 
-main()
+if __name__ == "__main__":
+    main()
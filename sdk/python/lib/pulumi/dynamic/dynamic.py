@@ -14,8 +14,12 @@
 
 import asyncio
 import base64
+import hashlib
+import os
 import pickle
-from typing import Any, Optional, List, TYPE_CHECKING, no_type_check, cast
+import threading
+import weakref
+from typing import Any, Dict, Optional, List, Tuple, Union, TYPE_CHECKING, no_type_check, cast
 
 import dill
 from .. import CustomResource, ResourceOptions
@@ -25,6 +29,12 @@ if TYPE_CHECKING:
 
 PROVIDER_KEY = "__provider"
 
+_PROVIDER_DIGEST_PREFIX = "sha256:"
+"""
+The prefix of `__provider` values that refer to a provider saved in the provider store by its digest, rather than
+holding the serialized provider itself.
+"""
+
 class CheckResult:
     """
     CheckResult represents the results of a call to `ResourceProvider.check`.
@@ -157,6 +167,18 @@ class ResourceProvider:
     """
     ResourceProvider is a Dynamic Resource Provider which allows defining new kinds of resources
     whose CRUD operations are implemented inside your Python program.
+
+    The provider server unpickles each provider once and shares it across every request for its resources, which run
+    concurrently on a pool of threads. State that a provider keeps on itself must be safe to use from several
+    operations at once.
+    """
+
+    serialize_once: bool = False
+    """
+    Set to true by providers whose pickled form never changes once a resource has used them: none of their attributes,
+    nested objects, class attributes or the globals their methods use are changed afterwards. The provider is then
+    serialized once, and the result reused for every resource that uses the same provider object. Other providers are
+    serialized for every resource, so that each resource records the provider as it was when the resource was created.
     """
 
     def check(self, _olds: Any, news: Any) -> CheckResult:
@@ -202,14 +224,102 @@ class ResourceProvider:
     def __init__(self) -> None:
         pass
 
+class AsyncResourceProvider:
+    """
+    AsyncResourceProvider is a Dynamic Resource Provider whose CRUD operations are coroutines. The provider server
+    runs them all on a single event loop, so providers that spend their time waiting on I/O can have many operations
+    in flight at once without a thread for each of them. As with ResourceProvider, each provider is unpickled once and
+    shared by all of those operations.
+    """
+
+    serialize_once: bool = False
+    """
+    Set to true by providers whose pickled form never changes once a resource has used them: none of their attributes,
+    nested objects, class attributes or the globals their methods use are changed afterwards. The provider is then
+    serialized once, and the result reused for every resource that uses the same provider object. Other providers are
+    serialized for every resource, so that each resource records the provider as it was when the resource was created.
+    """
+
+    async def check(self, _olds: Any, news: Any) -> CheckResult:
+        """
+        Check validates that the given property bag is valid for a resource of the given type.
+        """
+        return CheckResult(news, [])
+
+    async def diff(self, _id: str, _olds: Any, _news: Any) -> DiffResult:
+        """
+        Diff checks what impacts a hypothetical update will have on the resource's properties.
+        """
+        return DiffResult()
+
+    async def create(self, props: Any) -> CreateResult:
+        """
+        Create allocates a new instance of the provided resource and returns its unique ID
+        afterwards. If this call fails, the resource must not have been created (i.e., it is
+        "transactional").
+        """
+        raise Exception("Subclass of AsyncResourceProvider must implement 'create'")
+
+    async def read(self, id_: str, props: Any) -> ReadResult:
+        """
+        Reads the current live state associated with a resource.  Enough state must be included in
+        the inputs to uniquely identify the resource; this is typically just the resource ID, but it
+        may also include some properties.
+        """
+        return ReadResult(id_, props)
+
+    async def update(self, _id: str, _olds: Any, _news: Any) -> UpdateResult:
+        """
+        Update updates an existing resource with new values.
+        """
+        return UpdateResult()
+
+    async def delete(self, _id: str, _props: Any) -> None:
+        """
+        Delete tears down an existing resource with the given ID.  If it fails, the resource is
+        assumed to still exist.
+        """
+
+    def __init__(self) -> None:
+        pass
+
+_serialize_lock = threading.Lock()
+_serialized_providers: Dict[int, Tuple['weakref.ref[Union[ResourceProvider, AsyncResourceProvider]]', str]] = {}
+
+def serialize_provider(provider: Union[ResourceProvider, AsyncResourceProvider]) -> str:
+    """
+    Serializes the given provider. Serializing a provider is expensive, so for providers that set `serialize_once`, the
+    result is remembered while the provider is alive and handed back for every resource that uses the same provider
+    object.
+    """
+    # Serializing needs the lock, as it temporarily patches the pickle module.
+    with _serialize_lock:
+        if not getattr(provider, "serialize_once", False):
+            return _serialize_provider(provider)
+
+        key = id(provider)
+        cached = _serialized_providers.get(key)
+        if cached is not None and cached[0]() is provider:
+            return cached[1]
+
+        serialized = _serialize_provider(provider)
+        try:
+            ref = weakref.ref(provider, lambda _: _serialized_providers.pop(key, None))
+        except TypeError:
+            # Providers that can't be weakly referenced aren't remembered, as we couldn't tell once their ID is reused.
+            return serialized
+        _serialized_providers[key] = (ref, serialized)
+        return serialized
+
 # TODO[python/mypy#1102]: mypy doesn't currently support multiline comments
 # multiple errors related to the type assignment we're doing in this method eg 'Picker = _Pickler'
 @no_type_check
-def serialize_provider(provider: ResourceProvider) -> str:
-        # We need to customize our Pickler to ensure we sort dictionaries before serializing to try to
+def _serialize_provider(provider: Union[ResourceProvider, AsyncResourceProvider]) -> str:
+    # We need to customize our Pickler to ensure we sort dictionaries before serializing to try to
     # ensure we get a deterministic result.  Without this we would see changes to our serialized
     # provider even when there are no actual changes.
     old_pickler = pickle.Pickler
+    old_save_dict = pickle._Pickler.save_dict # pylint: disable=protected-access
     pickle.Pickler = pickle._Pickler # pylint: disable=protected-access
     def save_dict_sorted(self, obj):
         if self.bin:
@@ -228,6 +338,44 @@ def serialize_provider(provider: ResourceProvider) -> str:
     finally:
         # Restore the original pickler
         pickle.Pickler = old_pickler
+        pickle._Pickler.save_dict = old_save_dict # pylint: disable=protected-access
+
+def _store_provider(serialized: str, store: str) -> str:
+    """
+    Saves a serialized provider in the given store directory under its digest, returning the `__provider` value that
+    refers to it.
+    """
+    digest = hashlib.sha256(serialized.encode()).hexdigest()
+    path = os.path.join(store, digest)
+    if not os.path.exists(path):
+        os.makedirs(store, exist_ok=True)
+        # Write the provider under a temporary name first, so that nobody reads it half-written.
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as f:
+            f.write(serialized)
+        os.replace(tmp_path, path)
+    return _PROVIDER_DIGEST_PREFIX + digest
+
+def _provider_store() -> Optional[str]:
+    """
+    Returns the absolute path of the provider store directory set by PULUMI_DYNAMIC_PROVIDER_STORE, if any.
+    """
+    store = os.getenv("PULUMI_DYNAMIC_PROVIDER_STORE")
+    return os.path.abspath(store) if store else None
+
+def _load_provider(value: str) -> str:
+    """
+    Returns the serialized provider for the given `__provider` value, reading it from the provider store if the value
+    refers to it by digest.
+    """
+    if not value.startswith(_PROVIDER_DIGEST_PREFIX):
+        return value
+    store = _provider_store()
+    if not store:
+        raise Exception(f"The dynamic provider {value} was saved in a provider store, "
+                        "but PULUMI_DYNAMIC_PROVIDER_STORE is not set")
+    with open(os.path.join(store, value[len(_PROVIDER_DIGEST_PREFIX):])) as f:
+        return f.read()
 
 class Resource(CustomResource):
     """
@@ -235,12 +383,13 @@ class Resource(CustomResource):
     """
 
     def __init__(self,
-                 provider: ResourceProvider,
+                 provider: Union[ResourceProvider, AsyncResourceProvider],
                  name: str,
                  props: 'Inputs',
                  opts: Optional[ResourceOptions] = None) -> None:
         """
-        :param str provider: The implementation of the resource's CRUD operations.
+        :param str provider: The implementation of the resource's CRUD operations, either as a ResourceProvider or as
+               an AsyncResourceProvider.
         :param str name: The name of this resource.
         :param Optional[dict] props: The arguments to use to populate the new resource. Must not define the reserved
                 property "__provider".
@@ -251,6 +400,10 @@ class Resource(CustomResource):
             raise  Exception("A dynamic resource must not define the __provider key")
 
         props = cast(dict, props)
-        props[PROVIDER_KEY] = serialize_provider(provider)
+        serialized = serialize_provider(provider)
+        # Providers are normally stored in full with every resource. If a provider store is configured, each provider
+        # is saved there once and resources refer to it by its digest instead.
+        store = _provider_store()
+        props[PROVIDER_KEY] = _store_provider(serialized, store) if store else serialized
 
         super(Resource, self).__init__("pulumi-python:dynamic:Resource", name, props, opts)
@@ -34,11 +34,17 @@ class InvokeOptions:
     An optional version. If provided, the provider plugin with exactly this version will be used to service
     the invocation.
     """
+    cache: bool
+    """
+    Whether the result of this invoke may be shared with identical invokes when the invoke cache is enabled. Set this
+    to False for functions whose results may change during a deployment.
+    """
 
     def __init__(self,
                  parent: Optional['Resource'] = None,
                  provider: Optional['ProviderResource'] = None,
-                 version: Optional[str] = "") -> None:
+                 version: Optional[str] = "",
+                 cache: bool = True) -> None:
         """
         :param Optional[Resource] parent: An optional parent to use for default options for this invoke (e.g. the
                default provider to use).
@@ -46,7 +52,10 @@ class InvokeOptions:
                supplied, the default provider for the invoked function's package will be used.
         :param Optional[str] version: An optional version. If provided, the provider plugin with exactly this version
                will be used to service the invocation.
+        :param bool cache: Whether the result of this invoke may be shared with identical invokes when the invoke cache
+               is enabled. Set this to False for functions whose results may change during a deployment.
         """
         self.parent = parent
         self.provider = provider
         self.version = version
+        self.cache = cache
@@ -15,11 +15,11 @@
 """
 Utility functions for logging messages to the diagnostic stream of the Pulumi CLI.
 """
-import asyncio
 import sys
 from typing import Optional, TYPE_CHECKING
 
-from .runtime.settings import get_engine
+from .runtime.log_sender import LOG_SENDER
+from .runtime.settings import get_engine, is_debug_logging_enabled
 from .runtime.proto import engine_pb2
 
 if TYPE_CHECKING:
@@ -35,6 +35,8 @@ def debug(msg: str, resource: Optional['Resource'] = None, stream_id: Optional[i
     :param Optional[Resource] resource: If provided, associate this message with the given resource in the Pulumi CLI.
     :param Optional[int] stream_id: If provided, associate this message with a stream of other messages.
     """
+    if not is_debug_logging_enabled():
+        return
     engine = get_engine()
     if engine is not None:
         _log(engine, engine_pb2.DEBUG, msg, resource, stream_id)
@@ -94,18 +96,6 @@ def _log(engine, severity, message, resource, stream_id):
     if stream_id is None:
         stream_id = 0
 
-    # If we can log synchronously, do so. The worst thing we can do with a log message is exit
-    # before we have the chance to send the message.
-    #
-    # We can log synchronously as long as we haven't been given a resource to attach to. If we have,
-    # we have to asynchronously resolve the URN first.
-    async def do_log():
-        resolved_urn = await resource.urn.future()
-        req = engine_pb2.LogRequest(severity=severity, message=message, urn=resolved_urn, streamId=stream_id)
-        engine.Log(req)
-
-    if resource is not None:
-        asyncio.ensure_future(do_log())
-    else:
-        req = engine_pb2.LogRequest(severity=severity, message=message, urn="", streamId=stream_id)
-        engine.Log(req)
+    # Messages are sent to the engine from a background thread, so that logging never blocks on a round trip to the
+    # engine. Messages attached to a resource are sent once the resource's URN is known.
+    LOG_SENDER.log(engine, severity, message, resource, stream_id)
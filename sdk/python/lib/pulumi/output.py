@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
-from functools import reduce
 from inspect import isawaitable
 from typing import (
     TypeVar,
@@ -26,6 +25,7 @@ from typing import (
     Any,
     List,
     Optional,
+    Tuple,
     TYPE_CHECKING
 )
 
@@ -43,6 +43,168 @@ Input = Union[T, Awaitable[T], 'Output[T]']
 Inputs = Mapping[str, Input[Any]]
 
 
+_Resolution = Tuple[Any, bool, bool, Set['Resource'], bool]
+"""
+The fully resolved state of an Output: its value, whether it is known, whether it is secret, the resources it
+depends on and whether its value contains any unknowns.
+"""
+
+
+def _resolution(value: Any, is_known: bool, is_secret: bool, resources: Set['Resource'],
+                has_unknowns: Optional[bool] = None) -> _Resolution:
+    # Values are only scanned for unknowns once, when they are resolved; callers that already know the answer
+    # (e.g. because the value came from another output) pass it along.
+    if has_unknowns is None:
+        has_unknowns = contains_unknowns(value)
+    # An output is only known if the engine told us so and its value doesn't contain any unknowns.
+    return (value, bool(is_known) and not has_unknowns, bool(is_secret), resources, has_unknowns)
+
+
+class _ApplyFailure:
+    """
+    Stands in for the value of an Output whose apply raised. Reading the value re-raises the apply's exception.
+    """
+
+    __slots__ = ('_failed',)
+
+    def __init__(self, exn: BaseException) -> None:
+        # The exception is held in a failed future so that, as for any other failed future, asyncio reports it if the
+        # value is never read.
+        self._failed: asyncio.Future = asyncio.get_event_loop().create_future()
+        self._failed.set_exception(exn)
+
+    def reraise(self):
+        self._failed.result()
+
+
+def _failed_resolution(exn: BaseException, resources: Set['Resource']) -> _Resolution:
+    # An Output whose apply raised is neither known nor secret, and still depends on the resources of the Output the
+    # apply ran on; only its value is unavailable.
+    return (_ApplyFailure(exn), False, False, resources, False)
+
+
+def _value_of(resolution: _Resolution) -> Any:
+    """
+    Returns the value of the given resolution, raising the exception of the apply that produced it if that failed.
+    """
+    value = resolution[0]
+    if isinstance(value, _ApplyFailure):
+        value.reraise()
+    return value
+
+
+def _chain(source: asyncio.Future, target: asyncio.Future,
+           on_result: Optional[Callable[[Any], None]] = None) -> None:
+    """
+    Settles `target` once `source` is done: failures are copied over, and results are passed to `on_result` (or
+    copied over, if there is no `on_result`).
+    """
+    def on_done(fut: asyncio.Future):
+        if target.done():
+            return
+        if fut.cancelled():
+            target.cancel()
+            return
+        exn = fut.exception()
+        if exn is not None:
+            target.set_exception(exn)
+        elif on_result is not None:
+            on_result(fut.result())
+        else:
+            target.set_result(fut.result())
+
+    source.add_done_callback(on_done)
+
+
+def _then_value(source: asyncio.Future, func: Callable[[Any], Any]) -> asyncio.Future:
+    """
+    Returns a future for the result of calling `func` on the result of `source`.
+    """
+    result: asyncio.Future = asyncio.get_event_loop().create_future()
+
+    def on_result(value: Any):
+        try:
+            result.set_result(func(value))
+        except Exception as exn: # pylint: disable=broad-except
+            result.set_exception(exn)
+
+    _chain(source, result, on_result)
+    return result
+
+
+def _then(cell: Union[_Resolution, 'asyncio.Future[_Resolution]'], func: Callable[[_Resolution], Any]) -> asyncio.Future:
+    """
+    Returns a future for the result of calling `func` on the resolution held in `cell` once it is available.
+    """
+    if isinstance(cell, tuple):
+        result: asyncio.Future = asyncio.get_event_loop().create_future()
+        result.set_result(func(cell))
+        return result
+    return _then_value(cell, func)
+
+
+def _gather_resolution(resources: Union[Awaitable[Set['Resource']], Set['Resource']],
+                       future: Awaitable[Any],
+                       is_known: Awaitable[bool],
+                       is_secret: Optional[Awaitable[bool]]) -> Union[_Resolution, 'asyncio.Future[_Resolution]']:
+    """
+    Combines the separate awaitables that make up an Output into a single cell. If they have all already resolved,
+    the resolution is returned directly; otherwise a future for it is returned.
+    """
+    parts: List[Any] = [future, is_known, is_secret, resources]
+    if is_secret is None:
+        parts[2] = False
+    pending: List[asyncio.Future] = []
+    for i, part in enumerate(parts):
+        if i == 3 and isinstance(part, set) or i == 2 and part is False:
+            continue
+        part = asyncio.ensure_future(part)
+        parts[i] = part
+        if not part.done() or part.cancelled() or part.exception() is not None:
+            pending.append(part)
+
+    def resolve() -> _Resolution:
+        values = [p.result() if asyncio.isfuture(p) else p for p in parts]
+        return _resolution(values[0], values[1], values[2], values[3])
+
+    if not pending:
+        return resolve()
+
+    cell: 'asyncio.Future[_Resolution]' = asyncio.get_event_loop().create_future()
+    remaining = [len(pending)]
+
+    def on_part_done(_fut: asyncio.Future):
+        remaining[0] -= 1
+        if remaining[0] > 0 or cell.done():
+            return
+        # Report failures in the same order in which they would have been observed when awaiting each part.
+        for part in parts:
+            if not asyncio.isfuture(part):
+                continue
+            if part.cancelled():
+                cell.cancel()
+                return
+            if part.exception() is not None:
+                cell.set_exception(part.exception())
+                return
+        cell.set_result(resolve())
+
+    for part in pending:
+        part.add_done_callback(on_part_done)
+    return cell
+
+
+def _is_prompt(val: Any) -> bool:
+    """
+    Returns true if the given value contains no Outputs or awaitables.
+    """
+    if isinstance(val, dict):
+        return all(_is_prompt(v) for v in val.values())
+    if isinstance(val, list):
+        return all(_is_prompt(v) for v in val)
+    return not isinstance(val, Output) and not isawaitable(val)
+
+
 @known_types.output
 class Output(Generic[T]):
     """
@@ -53,67 +215,108 @@ class Output(Generic[T]):
     dependency graph' to be created, which properly tracks the relationship between resources.
     """
 
-    _is_known: Awaitable[bool]
-    """
-    Whether or not this 'Output' should actually perform .apply calls.  During a preview,
-    an Output value may not be known (because it would have to actually be computed by doing an
-    'update').  In that case, we don't want to perform any .apply calls as the callbacks
-    may not expect an undefined value.  So, instead, we just transition to another Output
-    value that itself knows it should not perform .apply calls.
-    """
-
-    _is_secret: Awaitable[bool]
-    """
-    Where or not this 'Output' should be treated as containing secret data. Secret outputs are tagged when
-    flowing across the RPC interface to the resource monitor, such that when they are persisted to disk in
-    our state file, they are encrypted instead of being in plaintext.
-    """
+    __slots__ = ('_cell', '_value_future')
 
-    _future: Awaitable[T]
+    _cell: Union[_Resolution, 'asyncio.Future[_Resolution]']
     """
-    Future that actually produces the concrete value of this output.
+    The resolution of this Output, or a future for it if it has not resolved yet. Outputs of prompt values are
+    resolved from the start and never allocate any futures.
     """
 
-    _resources: Awaitable[Set['Resource']]
+    _value_future: Optional['asyncio.Future[Any]']
     """
-    The list of resources that this output value depends on.
+    A resolved future for the value of this Output, handed out by every call to `future` once the Output has resolved
+    to a value without any unknowns.
     """
 
     def __init__(self, resources: Union[Awaitable[Set['Resource']], Set['Resource']],
                  future: Awaitable[T], is_known: Awaitable[bool],
                  is_secret: Optional[Awaitable[bool]] = None) -> None:
-        is_known = asyncio.ensure_future(is_known)
-        future = asyncio.ensure_future(future)
+        self._set_cell(_gather_resolution(resources, future, is_known, is_secret))
+
+    @staticmethod
+    def _from_cell(cell: Union[_Resolution, 'asyncio.Future[_Resolution]']) -> 'Output[Any]':
+        output: Output[Any] = object.__new__(Output)
+        output._set_cell(cell)
+        return output
+
+    def _set_cell(self, cell: Union[_Resolution, 'asyncio.Future[_Resolution]']):
+        self._cell = cell
+        self._value_future = None
+        if not isinstance(cell, tuple):
+            cell.add_done_callback(self._on_resolved)
+
+    def _on_resolved(self, cell: 'asyncio.Future[_Resolution]'):
+        # Once resolved, drop the future so that later reads don't need to go through it.
+        if not cell.cancelled() and cell.exception() is None:
+            self._cell = cell.result()
+
+    async def _resolution(self) -> _Resolution:
+        cell = self._cell
+        if isinstance(cell, tuple):
+            return cell
+        return await cell
+
+    async def _resolve(self) -> _Resolution:
+        """
+        Returns the resolution of this Output, raising the exception of the apply that produced it if that failed.
+        """
+        resolution = await self._resolution()
+        _value_of(resolution)
+        return resolution
 
-        async def is_value_known() -> bool:
-            return await is_known and not contains_unknowns(await future)
+    @property
+    def _future(self) -> Awaitable[T]:
+        """
+        Future that actually produces the concrete value of this output.
+        """
+        return _then(self._cell, _value_of)
 
-        if isinstance(resources, set):
-            self._resources = asyncio.Future()
-            self._resources.set_result(resources)
-        else:
-            self._resources = asyncio.ensure_future(resources)
+    @property
+    def _is_known(self) -> Awaitable[bool]:
+        """
+        Whether or not this 'Output' should actually perform .apply calls.  During a preview,
+        an Output value may not be known (because it would have to actually be computed by doing an
+        'update').  In that case, we don't want to perform any .apply calls as the callbacks
+        may not expect an undefined value.  So, instead, we just transition to another Output
+        value that itself knows it should not perform .apply calls.
+        """
+        return _then(self._cell, lambda r: r[1])
 
-        self._future = future
-        self._is_known = asyncio.ensure_future(is_value_known())
+    @property
+    def _is_secret(self) -> Awaitable[bool]:
+        """
+        Where or not this 'Output' should be treated as containing secret data. Secret outputs are tagged when
+        flowing across the RPC interface to the resource monitor, such that when they are persisted to disk in
+        our state file, they are encrypted instead of being in plaintext.
+        """
+        return _then(self._cell, lambda r: r[2])
 
-        if is_secret is not None:
-            self._is_secret = asyncio.ensure_future(is_secret)
-        else:
-            self._is_secret = asyncio.Future()
-            self._is_secret.set_result(False)
+    @property
+    def _resources(self) -> Awaitable[Set['Resource']]:
+        """
+        The list of resources that this output value depends on.
+        """
+        return _then(self._cell, lambda r: r[3])
 
     # Private implementation details - do not document.
     def resources(self) -> Awaitable[Set['Resource']]:
         return self._resources
 
     def future(self, with_unknowns: Optional[bool] = None) -> Awaitable[Optional[T]]:
+        cell = self._cell
+        if isinstance(cell, tuple) and not cell[4]:
+            # The value can't change any more and there are no unknowns to hide, so every caller can share one future.
+            if self._value_future is None:
+                self._value_future = _then(cell, _value_of)
+            return self._value_future
+
         # If the caller did not explicitly ask to see unknown values and the value of this output contains unnkowns,
         # return None. This preserves compatibility with earlier versios of the Pulumi SDK.
-        async def get_value() -> Optional[T]:
-            val = await self._future
-            return None if not with_unknowns and contains_unknowns(val) else val
-        return asyncio.ensure_future(get_value())
+        def get_value(resolution: _Resolution) -> 'Optional[T]':
+            value = _value_of(resolution)
+            return None if not with_unknowns and resolution[4] else value
+        return _then(self._cell, get_value)
 
     def is_known(self) -> Awaitable[bool]:
         return self._is_known
@@ -141,77 +344,87 @@ class Output(Generic[T]):
         :return: A transformed Output obtained from running the transformation function on this Output's value.
         :rtype: Output[U]
         """
-        result_resources: asyncio.Future[Set['Resource']] = asyncio.Future()
-        result_is_known: asyncio.Future[bool] = asyncio.Future()
-        result_is_secret: asyncio.Future[bool] = asyncio.Future()
 
-        # The "run" coroutine actually runs the apply.
-        async def run() -> U:
+        # The "run" function actually runs the apply once this output has resolved. It returns either the resolution
+        # of the new output or, if the callback handed back something that is still pending, a future for it.
+        def run(resolution: _Resolution) -> 'Union[_Resolution, asyncio.Future[_Resolution]]':
+            value, is_known, is_secret, resources, has_unknowns = resolution
+            if isinstance(value, _ApplyFailure):
+                # Applies on the output of an apply that raised fail the same way.
+                return resolution
+
+            if runtime.is_dry_run():
+                # During previews only perform the apply if the engine was able togive us an actual value for this
+                # Output or if the caller is able to tolerate unknown values.
+                apply_during_preview = is_known or run_with_unknowns
+
+                if not apply_during_preview:
+                    # We didn't actually run the function, our new Output is definitely
+                    # **not** known and **not** secret
+                    return (None, False, False, resources, False)
+
+                # If we are running with unknown values and the value is explicitly unknown but does not actually
+                # contain any unknown values, collapse its value to the unknown value. This ensures that callbacks
+                # that expect to see unknowns during preview in outputs that are not known will always do so.
+                if not is_known and run_with_unknowns and not has_unknowns:
+                    value = cast(T, UNKNOWN)
+
+            transformed: Input[U] = func(value)
+            # Transformed is an Input, meaning there are three cases:
+            #  1. transformed is an Output[U]
+            if isinstance(transformed, Output):
+                transformed_as_output = cast(Output[U], transformed)
+                # Forward along the inner output's resources, known-ness and secret-ness.
+                def forward(inner: _Resolution) -> _Resolution:
+                    inner_value, inner_is_known, inner_is_secret, inner_resources, inner_has_unknowns = inner
+                    return _resolution(inner_value, inner_is_known, inner_is_secret or is_secret,
+                                       resources | inner_resources, inner_has_unknowns)
+                inner_cell = transformed_as_output._cell
+                return forward(inner_cell) if isinstance(inner_cell, tuple) else _then(inner_cell, forward)
+
+            #  2. transformed is an Awaitable[U]
+            if isawaitable(transformed):
+                # Since transformed is not an Output, it is both known and not a secret.
+                return _then_value(asyncio.ensure_future(cast(Awaitable[U], transformed)),
+                                   lambda v: _resolution(v, True, False, resources))
+
+            #  3. transformed is U. It is trivially known.
+            return _resolution(transformed, True, False, resources)
+
+        # Run the apply from a plain callback as soon as this output resolves, rather than from a task of its own.
+        loop = asyncio.get_event_loop()
+        result: 'asyncio.Future[_Resolution]' = loop.create_future()
+
+        def run_and_resolve(resolution: _Resolution):
+            if result.done():
+                return
             try:
-                # Await this output's details.
-                resources = await self._resources
-                is_known = await self._is_known
-                is_secret = await self._is_secret
-                value = await self._future
-
-                if runtime.is_dry_run():
-                    # During previews only perform the apply if the engine was able togive us an actual value for this
-                    # Output or if the caller is able to tolerate unknown values.
-                    apply_during_preview = is_known or run_with_unknowns
-
-                    if not apply_during_preview:
-                        # We didn't actually run the function, our new Output is definitely
-                        # **not** known and **not** secret
-                        result_resources.set_result(resources)
-                        result_is_known.set_result(False)
-                        result_is_secret.set_result(False)
-                        return cast(U, None)
-
-                    # If we are running with unknown values and the value is explicitly unknown but does not actually
-                    # contain any unknown values, collapse its value to the unknown value. This ensures that callbacks
-                    # that expect to see unknowns during preview in outputs that are not known will always do so.
-                    if not is_known and run_with_unknowns and not contains_unknowns(value):
-                        value = cast(T, UNKNOWN)
-
-                transformed: Input[U] = func(value)
-                # Transformed is an Input, meaning there are three cases:
-                #  1. transformed is an Output[U]
-                if isinstance(transformed, Output):
-                    transformed_as_output = cast(Output[U], transformed)
-                    # Forward along the inner output's _resources, _is_known and _is_secret values.
-                    transformed_resources = await transformed_as_output._resources
-                    result_resources.set_result(resources | transformed_resources)
-                    result_is_known.set_result(await transformed_as_output._is_known)
-                    result_is_secret.set_result(await transformed_as_output._is_secret or is_secret)
-                    return await transformed.future(with_unknowns=True)
-
-                #  2. transformed is an Awaitable[U]
-                if isawaitable(transformed):
-                    # Since transformed is not an Output, it is both known and not a secret.
-                    result_resources.set_result(resources)
-                    result_is_known.set_result(True)
-                    result_is_secret.set_result(False)
-                    return await cast(Awaitable[U], transformed)
-
-                #  3. transformed is U. It is trivially known.
-                result_resources.set_result(resources)
-                result_is_known.set_result(True)
-                result_is_secret.set_result(False)
-                return cast(U, transformed)
-            finally:
-                # Always resolve the future if it hasn't been done already.
-                if not result_is_known.done():
-                    # Try and set the result. This might fail if we're shutting down,
-                    # so swallow that error if that occurs.
-                    try:
-                        result_resources.set_result(resources)
-                        result_is_known.set_result(False)
-                        result_is_secret.set_result(False)
-                    except RuntimeError:
-                        pass
-
-        run_fut = asyncio.ensure_future(run())
-        return Output(result_resources, run_fut, result_is_known, result_is_secret)
+                ran = run(resolution)
+            except Exception as exn: # pylint: disable=broad-except
+                result.set_result(_failed_resolution(exn, resolution[3]))
+                return
+            if isinstance(ran, tuple):
+                result.set_result(ran)
+                return
+
+            def on_ran(fut: 'asyncio.Future[_Resolution]'):
+                if result.done():
+                    return
+                if fut.cancelled():
+                    result.cancel()
+                    return
+                exn = fut.exception()
+                result.set_result(_failed_resolution(exn, resolution[3]) if exn is not None else fut.result())
+            ran.add_done_callback(on_ran)
+
+        cell = self._cell
+        if isinstance(cell, tuple):
+            # This output has already resolved, so there's nothing to wait for. The apply still runs on a later turn
+            # of the event loop, never during the call to apply itself.
+            loop.call_soon(run_and_resolve, cell)
+        else:
+            _chain(cell, result, run_and_resolve)
+        return cast('Output[U]', Output._from_cell(result))
 
     def __getattr__(self, item: str) -> 'Output[Any]': # type: ignore
         """
@@ -245,8 +458,12 @@ class Output(Generic[T]):
         :rtype: Output[T]
         """
 
-        # Is it an output already? Recurse into the value contained within it.
+        # Is it an output already? Recurse into the value contained within it, unless it has already resolved to a
+        # known value that has nothing to recurse into.
         if isinstance(val, Output):
+            cell = val._cell
+            if isinstance(cell, tuple) and cell[1] and _is_prompt(cell[0]):
+                return val
             return val.apply(Output.from_input, True)
 
         # Is a dict or list? Recurse into the values within them.
@@ -264,23 +481,17 @@ class Output(Generic[T]):
             output: Output[T] = cast(Output[T], Output.all(*list(list_items))) # type: ignore
             return output
 
-        # If it's not an output, list, or dict, it must be known and not secret
-        is_known_fut: asyncio.Future[bool] = asyncio.Future()
-        is_secret_fut: asyncio.Future[bool] = asyncio.Future()
-        is_known_fut.set_result(True)
-        is_secret_fut.set_result(False)
-
         # Is it awaitable? If so, schedule it for execution and use the resulting future
         # as the value future for a new output.
         if isawaitable(val):
-            val_fut = cast(asyncio.Future, val)
-            promise_output = Output(set(), asyncio.ensure_future(val_fut), is_known_fut, is_secret_fut)
+            async def resolve_awaitable() -> _Resolution:
+                # If it's not an output, list, or dict, it must be known and not secret
+                return _resolution(await cast(Awaitable[Any], val), True, False, set())
+            promise_output = Output._from_cell(asyncio.ensure_future(resolve_awaitable()))
             return promise_output.apply(Output.from_input, True)
 
-        # Is it a prompt value? Set up a new resolved future and use that as the value future.
-        value_fut: asyncio.Future[Any] = asyncio.Future()
-        value_fut.set_result(val)
-        return Output(set(), value_fut, is_known_fut, is_secret_fut)
+        # Is it a prompt value? It is already resolved.
+        return cast('Output[T]', Output._from_cell(_resolution(val, True, False, set())))
 
     @staticmethod
     def secret(val: Input[T]) -> 'Output[T]':
@@ -295,9 +506,10 @@ class Output(Generic[T]):
         """
 
         o = Output.from_input(val)
-        is_secret: asyncio.Future[bool] = asyncio.Future()
-        is_secret.set_result(True)
-        return Output(o._resources, o._future, o._is_known, is_secret)
+        cell = o._cell
+        if isinstance(cell, tuple):
+            return cast('Output[T]', Output._from_cell((cell[0], cell[1], True, cell[3], cell[4])))
+        return cast('Output[T]', Output._from_cell(_then(cell, lambda r: (r[0], r[1], True, r[3], r[4]))))
 
     @staticmethod
     def all(*args: List[Input[T]]) -> 'Output[List[T]]':
@@ -313,43 +525,32 @@ class Output(Generic[T]):
         :rtype: Output[List[T]]
         """
 
-        # Three asynchronous helper functions to assist in the implementation:
-        # is_known, which returns True if all of the input's values are known,
-        # and false if any of them are not known,
-        async def is_known(outputs):
-            is_known_futures = list(map(lambda o: o._is_known, outputs))
-            each_is_known = await asyncio.gather(*is_known_futures)
-            return all(each_is_known)
-
-        # is_secret, which returns True if any of the input values are secret, and
-        # false if none of them are secret.
-        async def is_secret(outputs):
-            is_secret_futures = list(map(lambda o: o._is_secret, outputs))
-            each_is_secret = await asyncio.gather(*is_secret_futures)
-            return any(each_is_secret)
-
-        async def get_resources(outputs):
-            resources_futures = list(map(lambda o: o._resources, outputs))
-            resources_agg = await asyncio.gather(*resources_futures)
-            # Merge the list of resource dependencies across all inputs.
-            return reduce(lambda acc, r: acc.union(r), resources_agg, set())
-
-        # gather_futures, which aggregates the list of futures in each input to a future of a list.
-        async def gather_futures(outputs):
-            value_futures = list(map(lambda o: asyncio.ensure_future(o.future(with_unknowns=True)), outputs))
-            return await asyncio.gather(*value_futures)
         from_input = cast(Callable[[List[Union[T, Awaitable[T], Output[T]]]], Output[T]], Output.from_input)
         # First, map all inputs to outputs using `from_input`.
         all_outputs = list(map(from_input, args))
 
-        # Aggregate the list of futures into a future of lists.
-        value_futures = asyncio.ensure_future(gather_futures(all_outputs))
-
-        # Aggregate whether or not this output is known.
-        resources_futures = asyncio.ensure_future(get_resources(all_outputs))
-        known_futures = asyncio.ensure_future(is_known(all_outputs))
-        secret_futures = asyncio.ensure_future(is_secret(all_outputs))
-        return Output(resources_futures, value_futures, known_futures, secret_futures)
+        # Combine the resolutions of each output: the values are gathered into a list, the result is known only if
+        # every input is known, is secret if any input is secret, and depends on every input's resources. The list
+        # contains unknowns exactly when one of the inputs does, so it never needs to be re-scanned.
+        def combine(resolutions: 'List[_Resolution]') -> _Resolution:
+            resources: Set['Resource'] = set()
+            for r in resolutions:
+                resources |= r[3]
+            failure = next((r[0] for r in resolutions if isinstance(r[0], _ApplyFailure)), None)
+            return (failure if failure is not None else [r[0] for r in resolutions],
+                    all(r[1] for r in resolutions),
+                    any(r[2] for r in resolutions),
+                    resources,
+                    any(r[4] for r in resolutions))
+
+        cells = [o._cell for o in all_outputs]
+        if all(isinstance(cell, tuple) for cell in cells):
+            return Output._from_cell(combine(cast(List[_Resolution], cells)))
+
+        async def gather_resolutions() -> _Resolution:
+            return combine([await o._resolution() for o in all_outputs])
+
+        return Output._from_cell(asyncio.ensure_future(gather_resolutions()))
 
     @staticmethod
     def concat(*args: List[Input[str]]) -> 'Output[str]':
@@ -13,11 +13,12 @@
 # limitations under the License.
 
 """The Resource module, containing all resource-related definitions."""
-from typing import Optional, List, Any, Mapping, Union, Callable, TYPE_CHECKING, cast
+from typing import Optional, List, Any, Awaitable, Mapping, Union, Callable, Tuple, TYPE_CHECKING, cast
 
+import asyncio
 import copy
 
-from .runtime import known_types
+from .runtime import known_types, rpc
 from .runtime.resource import register_resource, register_resource_outputs, read_resource
 from .runtime.settings import get_root_resource
 
@@ -589,6 +590,25 @@ class Resource:
     The name assigned to the resource at construction.
     """
 
+    _input_property_names: Optional[Mapping[str, str]] = None
+    """
+    An optional static table used by `translate_input_property` to translate the names of input properties. Classes
+    with a fixed naming scheme can declare this rather than overriding `translate_input_property`.
+    """
+
+    _output_property_names: Optional[Mapping[str, str]] = None
+    """
+    An optional static table used by `translate_output_property` to translate the names of output properties. Classes
+    with a fixed naming scheme can declare this rather than overriding `translate_output_property`.
+    """
+
+    _translations_are_static: bool = False
+    """
+    Whether this class's `translate_input_property` and `translate_output_property` depend only on the property name.
+    The runtime remembers the translations of classes that don't override those methods, or that set this, for every
+    resource of the class. Other overrides are called for every property name they translate.
+    """
+
 # !!! IMPORTANT !!! If you add a new attribute to this type, make sure to verify that merge_options
 # works properly for it.
 
@@ -731,22 +751,32 @@ class Resource:
         Provides subclasses of Resource an opportunity to translate names of output properties
         into a format of their choosing before writing those properties to the resource object.
 
+        By default, names are looked up in the class's `_output_property_names` table, if it has one.
+        Subclasses whose translations depend only on `prop` can set `_translations_are_static` so that the runtime
+        remembers them for every resource of the class.
+
         :param str prop: A property name.
         :return: A potentially transformed property name.
         :rtype: str
         """
-        return prop
+        names = self._output_property_names
+        return names.get(prop, prop) if names is not None else prop
 
     def translate_input_property(self, prop: str) -> str:
         """
         Provides subclasses of Resource an opportunity to translate names of input properties into
         a format of their choosing before sending those properties to the Pulumi engine.
 
+        By default, names are looked up in the class's `_input_property_names` table, if it has one.
+        Subclasses whose translations depend only on `prop` can set `_translations_are_static` so that the runtime
+        remembers them for every resource of the class.
+
         :param str prop: A property name.
         :return: A potentially transformed property name.
         :rtype: str
         """
-        return prop
+        names = self._input_property_names
+        return names.get(prop, prop) if names is not None else prop
 
     def get_provider(self, module_member: str) -> Optional['ProviderResource']:
         """
@@ -766,6 +796,22 @@ class Resource:
         [pkg, _, _] = components
         return self._providers.get(pkg)
 
+    _urn_future: Optional[Tuple['Output[str]', 'asyncio.Future[str]']] = None
+    """
+    The future handed out by `_resolved_urn`, along with the URN output it was made from.
+    """
+
+    def _resolved_urn(self) -> 'asyncio.Future[str]':
+        """
+        Returns a future for this resource's URN. The future is shared by everything that waits for the URN, so a
+        resource with many dependents only has its URN resolved once.
+        """
+        urn = self.urn
+        cached = self._urn_future
+        if cached is None or cached[0] is not urn or cached[1].cancelled():
+            cached = self._urn_future = (urn, asyncio.ensure_future(cast('Awaitable[str]', urn.future())))
+        return cached[1]
+
 
 @known_types.custom_resource
 class CustomResource(Resource):
@@ -848,6 +894,11 @@ class ProviderResource(CustomResource):
     package is the name of the package this is provider for.  Common examples are "aws" and "azure".
     """
 
+    _ref_future: Optional[Tuple['Output[str]', 'Output[str]', 'asyncio.Future[str]']] = None
+    """
+    The future handed out by `_resolved_provider_ref`, along with the URN and ID outputs it was made from.
+    """
+
     def __init__(self,
                  pkg: str,
                  name: str,
@@ -869,6 +920,22 @@ class ProviderResource(CustomResource):
             self, f"pulumi:providers:{pkg}", name, props, opts)
         self.package = pkg
 
+    def _resolved_provider_ref(self) -> 'asyncio.Future[str]':
+        """
+        Returns a future for the reference that the engine uses to identify this provider, made up of its URN and ID.
+        Like `_resolved_urn`, the future is shared by every resource that uses this provider.
+        """
+        urn, id_ = self.urn, self.id # pylint: disable=no-member
+        cached = self._ref_future
+        if cached is None or cached[0] is not urn or cached[1] is not id_ or cached[2].cancelled():
+            async def resolve() -> str:
+                provider_urn, provider_id = await asyncio.gather(self._resolved_urn(), id_.future())
+                # A provider reference is a well-known string (two ::-separated values) that the engine interprets.
+                return f"{provider_urn}::{provider_id or rpc.UNKNOWN}"
+
+            cached = self._ref_future = (urn, id_, asyncio.ensure_future(resolve()))
+        return cached[2]
+
 
 def export(name: str, value: Any):
     """
@@ -16,6 +16,8 @@
 The runtime implementation of the Pulumi Python SDK.
 """
 
+import sys
+
 from .config import (
     set_config,
     get_config,
@@ -23,12 +25,6 @@ from .config import (
     get_config_env_key,
 )
 
-from .mocks import (
-    Mocks,
-    set_mocks,
-    test,
-)
-
 from .settings import (
     Settings,
     configure,
@@ -43,4 +39,23 @@ from .stack import (
 
 from .invoke import (
     invoke,
+    invoke_async,
+    invoke_batch,
 )
+
+# Mocks are only used by unit tests, so they're imported the first time they're asked for rather than on every run.
+_LAZY_MEMBERS = {
+    "Mocks": ".mocks",
+    "set_mocks": ".mocks",
+    "test": ".mocks",
+}
+
+if sys.version_info >= (3, 7):
+    from .lazy import lazy_getattr as _lazy_getattr
+    __getattr__ = _lazy_getattr(__name__, globals(), _LAZY_MEMBERS)
+else:
+    from .mocks import (
+        Mocks,
+        set_mocks,
+        test,
+    )
@@ -15,7 +15,7 @@
 """
 Runtime support for the Pulumi configuration system.  Please use pulumi.Config instead.
 """
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 import json
 import os
@@ -23,6 +23,17 @@ import os
 # default to an empty map for config.
 CONFIG: Dict[str, Any] = dict()
 
+_env_config: Optional[Dict[str, Any]] = None
+"""
+The parsed contents of PULUMI_CONFIG. The language host sets PULUMI_CONFIG before the program starts, so it's parsed
+the first time it's needed and not again.
+"""
+
+_config_env_keys: Dict[str, str] = dict()
+"""
+The PULUMI_CONFIG_<k> environment variable for each configuration key that has been looked up.
+"""
+
 
 def set_config(k: str, v: Any):
     """
@@ -35,10 +46,15 @@ def get_config_env() -> Dict[str, Any]:
     """
     Returns the environment map that will be used for config checking when variables aren't set.
     """
-    if 'PULUMI_CONFIG' in os.environ:
-        env_config = os.environ['PULUMI_CONFIG']
-        return json.loads(env_config)
-    return dict()
+    return dict(_get_env_config())
+
+
+def _get_env_config() -> Dict[str, Any]:
+    global _env_config  # pylint: disable=global-statement
+    if _env_config is None:
+        env_config = os.environ.get('PULUMI_CONFIG')
+        _env_config = (json.loads(env_config) or {}) if env_config is not None else {}
+    return _env_config
 
 
 def get_config_env_key(k: str) -> str:
@@ -46,6 +62,13 @@ def get_config_env_key(k: str) -> str:
     Returns a scrubbed environment variable key, PULUMI_CONFIG_<k>, that can be used for
     setting explicit varaibles.  This is unlike PULUMI_CONFIG which is just a JSON-serialized bag.
     """
+    env_key = _config_env_keys.get(k)
+    if env_key is None:
+        env_key = _config_env_keys[k] = _make_config_env_key(k)
+    return env_key
+
+
+def _make_config_env_key(k: str) -> str:
     env_key = ''
     for c in k:
         if c == '_' or 'A' <= c <= 'Z' or '0' <= c <= '9':
@@ -62,17 +85,13 @@ def get_config(k: str) -> Any:
     Returns a configuration variable's value or None if it is unset.
     """
     # If the config has been set explicitly, use it.
-    if k in list(CONFIG.keys()):
+    if k in CONFIG:
         return CONFIG[k]
 
     # If there is a specific PULUMI_CONFIG_<k> environment variable, use it.
-    env_key = get_config_env_key(k)
-    if env_key in os.environ:
-        return os.environ[env_key]
+    env_value = os.environ.get(get_config_env_key(k))
+    if env_value is not None:
+        return env_value
 
     # If the config hasn't been set, but there is a process-wide PULUMI_CONFIG environment variable, use it.
-    env_dict = get_config_env()
-    if env_dict is not None and k in list(env_dict.keys()):
-        return env_dict[k]
-
-    return None
+    return _get_env_config().get(k)
@@ -13,7 +13,7 @@
 # limitations under the License.
 import asyncio
 import sys
-from typing import Any, Awaitable
+from typing import Any, Awaitable, Iterable, List, Optional, Tuple
 import grpc
 
 from .. import log
@@ -22,7 +22,7 @@ from ..invoke import InvokeOptions
 from ..runtime.proto import provider_pb2
 from . import rpc
 from .rpc_manager import RPC_MANAGER
-from .settings import get_monitor
+from .settings import get_monitor, call_monitor, get_invoke_cache, is_invoke_cache_enabled
 from .sync_await import _sync_await
 
 # This setting overrides a hardcoded maximum protobuf size in the python protobuf bindings. This avoids deserialization
@@ -62,64 +62,93 @@ def invoke(tok: str, props: Inputs, opts: InvokeOptions = None) -> InvokeResult:
     invoke dynamically invokes the function, tok, which is offered by a provider plugin.  The inputs
     can be a bag of computed values (Ts or Awaitable[T]s), and the result is a Awaitable[Any] that
     resolves when the invoke finishes.
+
+    The invoke blocks the caller until it finishes. Programs that make many invokes should prefer `invoke_async` or
+    `invoke_batch`, which let the invokes run concurrently.
+    """
+    return InvokeResult(_sync_await(invoke_async(tok, props, opts)))
+
+
+def invoke_async(tok: str, props: Inputs, opts: InvokeOptions = None) -> 'asyncio.Future[Any]':
+    """
+    invoke_async dynamically invokes the function, tok, which is offered by a provider plugin, without blocking the
+    caller. The result is a future for the function's outputs, so any number of invokes may be in flight at once; the
+    runtime bounds how many of them are sent to the engine concurrently.
     """
     log.debug(f"Invoking function: tok={tok}")
     if opts is None:
         opts = InvokeOptions()
 
-    async def do_invoke():
-        # If a parent was provided, but no provider was provided, use the parent's provider if one was specified.
-        if opts.parent is not None and opts.provider is None:
-            opts.provider = opts.parent.get_provider(tok)
-
-        # Construct a provider reference from the given provider, if one was provided to us.
-        provider_ref = None
-        if opts.provider is not None:
-            provider_urn = await opts.provider.urn.future()
-            provider_id = (await opts.provider.id.future()) or rpc.UNKNOWN
-            provider_ref = f"{provider_urn}::{provider_id}"
-            log.debug(f"Invoke using provider {provider_ref}")
-
-        monitor = get_monitor()
-        inputs = await rpc.serialize_properties(props, {})
-        version = opts.version or ""
-        log.debug(f"Invoking function prepared: tok={tok}")
-        req = provider_pb2.InvokeRequest(tok=tok, args=inputs, provider=provider_ref, version=version)
-
-        def do_invoke():
-            try:
-                return monitor.Invoke(req)
-            except grpc.RpcError as exn:
-                # gRPC-python gets creative with their exceptions. grpc.RpcError as a type is useless;
-                # the usefullness come from the fact that it is polymorphically also a grpc.Call and thus has
-                # the .code() member. Pylint doesn't know this because it's not known statically.
-                #
-                # Neither pylint nor I are the only ones who find this confusing:
-                # https://github.com/grpc/grpc/issues/10885#issuecomment-302581315
-                # pylint: disable=no-member
-                if exn.code() == grpc.StatusCode.UNAVAILABLE:
-                    sys.exit(0)
-
-                details = exn.details()
-            raise Exception(details)
-
-        resp = await asyncio.get_event_loop().run_in_executor(None, do_invoke)
-
-        log.debug(f"Invoking function completed successfully: tok={tok}")
-        # If the invoke failed, raise an error.
-        if resp.failures:
-            raise Exception(f"invoke of {tok} failed: {resp.failures[0].reason} ({resp.failures[0].property})")
-
-        # Otherwise, return the output properties.
-        ret_obj = getattr(resp, 'return')
-        if ret_obj:
-            return rpc.deserialize_properties(ret_obj)
-        return {}
-
     async def do_rpc():
-        resp, exn = await RPC_MANAGER.do_rpc("invoke", do_invoke)()
+        resp, exn = await RPC_MANAGER.do_rpc("invoke", _invoke)(tok, props, opts)
         if exn is not None:
             raise exn
         return resp
 
-    return InvokeResult(_sync_await(asyncio.ensure_future(do_rpc())))
+    return asyncio.ensure_future(do_rpc())
+
+
+def invoke_batch(invokes: Iterable[Tuple[str, Inputs, Optional[InvokeOptions]]]) -> 'asyncio.Future[List[Any]]':
+    """
+    invoke_batch issues a batch of invokes concurrently, each given as a tuple of the function token, its inputs and
+    its options. The result is a future for the outputs of each function, in the order in which they were given. If
+    any invoke fails, the future fails with the first error, although the other invokes still run to completion.
+    """
+    return asyncio.gather(*[invoke_async(tok, props, opts) for tok, props, opts in invokes])
+
+
+async def _invoke(tok: str, props: Inputs, opts: InvokeOptions) -> Any:
+    # If a parent was provided, but no provider was provided, use the parent's provider if one was specified.
+    if opts.parent is not None and opts.provider is None:
+        opts.provider = opts.parent.get_provider(tok)
+
+    # Construct a provider reference from the given provider, if one was provided to us.
+    provider_ref = None
+    if opts.provider is not None:
+        provider_ref = await opts.provider._resolved_provider_ref()
+        log.debug(f"Invoke using provider {provider_ref}")
+
+    monitor = get_monitor()
+    inputs = await rpc.serialize_properties(props, {})
+    version = opts.version or ""
+    log.debug(f"Invoking function prepared: tok={tok}")
+    req = provider_pb2.InvokeRequest(tok=tok, args=inputs, provider=provider_ref, version=version)
+
+    def do_invoke():
+        try:
+            return monitor.Invoke(req)
+        except grpc.RpcError as exn:
+            # gRPC-python gets creative with their exceptions. grpc.RpcError as a type is useless;
+            # the usefullness come from the fact that it is polymorphically also a grpc.Call and thus has
+            # the .code() member. Pylint doesn't know this because it's not known statically.
+            #
+            # Neither pylint nor I are the only ones who find this confusing:
+            # https://github.com/grpc/grpc/issues/10885#issuecomment-302581315
+            # pylint: disable=no-member
+            if exn.code() == grpc.StatusCode.UNAVAILABLE:
+                sys.exit(0)
+
+            details = exn.details()
+        raise Exception(details)
+
+    async def send() -> Any:
+        resp = await call_monitor(do_invoke)
+        # If the invoke failed, raise an error. This also keeps the failed response out of the invoke cache.
+        if resp.failures:
+            raise Exception(f"invoke of {tok} failed: {resp.failures[0].reason} ({resp.failures[0].property})")
+        return resp
+
+    if opts.cache and is_invoke_cache_enabled():
+        # Identical invokes share a response, so key them on everything that's sent to the engine. Serializing the
+        # arguments deterministically orders their keys, which makes the key independent of the order they were given.
+        key = (tok, inputs.SerializeToString(deterministic=True), provider_ref or "", version)
+        resp = await get_invoke_cache().get_or_invoke(key, send)
+    else:
+        resp = await send()
+
+    log.debug(f"Invoking function completed successfully: tok={tok}")
+    # Otherwise, return the output properties.
+    ret_obj = getattr(resp, 'return')
+    if ret_obj:
+        return rpc.deserialize_properties(ret_obj)
+    return {}
@@ -29,8 +29,13 @@ The implementation of this mechanism is that, for every known type, that type
 is stashed away in a global variable. Whenever the runtime wants to do a type
 test using that type (or instantiate an instance of this type), it uses the
 functions defined in this module to do so.
+
+`kind_of` classifies a value by the known type it is an instance of, with a
+single cached lookup on the value's type. The cache is rebuilt whenever any of
+the global variables changes.
 """
-from typing import Any, Optional
+import operator
+from typing import Any, Dict, Optional, Tuple
 
 _custom_resource_type: Optional[type] = None
 """The type of CustomResource. Filled-in as the Pulumi package is initializing."""
@@ -71,6 +76,78 @@ _output_type: Optional[type] = None
 _unknown_type: Optional[type] = None
 """The type of unknown. Filled-in as the Pulumi package is initializing."""
 
+_KIND_TYPE_NAMES: Tuple[str, ...] = (
+    "_custom_resource_type",
+    "_custom_timeouts_type",
+    "_asset_resource_type",
+    "_file_asset_resource_type",
+    "_string_asset_resource_type",
+    "_remote_asset_resource_type",
+    "_archive_resource_type",
+    "_asset_archive_resource_type",
+    "_file_archive_resource_type",
+    "_remote_archive_resource_type",
+    "_stack_resource_type",
+    "_output_type",
+    "_unknown_type",
+)
+"""The global variables holding the known types, in the order of the kinds they correspond to."""
+
+_get_known_types = operator.itemgetter(*_KIND_TYPE_NAMES)
+
+_KINDS: Tuple[str, ...] = (
+    "custom_resource",
+    "custom_timeouts",
+    "asset",
+    "file_asset",
+    "string_asset",
+    "remote_asset",
+    "archive",
+    "asset_archive",
+    "file_archive",
+    "remote_archive",
+    "stack",
+    "output",
+    "unknown",
+)
+"""The kind of each known type, which is the name of the decorator that registers it."""
+
+_kind_cache: Dict[type, Optional[str]] = {}
+"""Maps types that have been classified by `kind_of` to their kind, resolved through their MRO."""
+
+_kind_cache_types: Tuple[Optional[type], ...] = ()
+"""The known types that `_kind_cache` was filled in for."""
+
+
+def kind_of(obj: Any) -> Optional[str]:
+    """
+    Returns the kind of known type that the given object is an instance of, or None if it is not an instance of any
+    known type. The kind is the name of the decorator that registered the object's class or its nearest registered
+    base class (e.g. "custom_resource" or "file_asset"). Results are cached per type for as long as the known types
+    stay the same.
+    """
+    global _kind_cache_types
+    known = _get_known_types(globals())
+    if known != _kind_cache_types:
+        # A known type has been registered (or replaced) since the cache was filled in.
+        _kind_cache.clear()
+        _kind_cache_types = known
+
+    obj_type = type(obj)
+    try:
+        return _kind_cache[obj_type]
+    except KeyError:
+        pass
+
+    kinds = {known_type: kind for known_type, kind in zip(known, _KINDS) if known_type is not None}
+    kind = None
+    for base in obj_type.__mro__:
+        kind = kinds.get(base)
+        if kind is not None:
+            break
+    _kind_cache[obj_type] = kind
+    return kind
+
 def asset(class_obj: type) -> type:
     """
     Decorator to annotate the Asset class. Registers the decorated class
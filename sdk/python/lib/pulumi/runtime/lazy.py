@@ -0,0 +1,35 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Support for packages that import some of their members the first time they're asked for, rather than up front.
+"""
+import importlib
+from typing import Any, Callable, Dict, Mapping
+
+
+def lazy_getattr(package: str, package_globals: Dict[str, Any], members: Mapping[str, str]) -> Callable[[str], Any]:
+    """
+    Returns a module-level __getattr__ for the given package. `members` maps each name that's imported lazily to the
+    module, relative to the package, that defines it. A member is imported the first time it's asked for and saved in
+    `package_globals`, so later lookups find it directly. Any other name raises an AttributeError without importing
+    anything.
+    """
+    def __getattr__(name: str) -> Any:
+        module_name = members.get(name)
+        if module_name is None:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(module_name, package), name)
+        package_globals[name] = value
+        return value
+    return __getattr__
@@ -0,0 +1,218 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Support for sending log messages to the engine in the background.
+"""
+import asyncio
+import atexit
+import collections
+import threading
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from .proto import engine_pb2
+
+if TYPE_CHECKING:
+    from ..resource import Resource
+
+_MAX_QUEUED_MESSAGES = 1024
+"""
+The number of messages waiting to be sent beyond which new chunks of a stream are merged into the last waiting message
+where possible. Logging never blocks, so messages that can't be merged are queued regardless.
+"""
+
+_MAX_BATCH_SIZE = 64
+"""
+The most queued messages that the sender takes at once, coalescing them where it can before sending them.
+"""
+
+_URN_FLUSH_TIMEOUT = 5
+"""
+How long a flush waits, in seconds, for the URNs of resources that messages are waiting on.
+"""
+
+
+class _PendingMessage:
+    """
+    A message on a stream that must wait to be sent, either for the URN of its resource or for earlier messages on the
+    same stream.
+    """
+    __slots__ = ("engine", "severity", "message", "stream_id", "urn", "urn_future")
+
+    def __init__(self, engine: Any, severity: int, message: str, stream_id: int, urn: Optional[str]):
+        self.engine = engine
+        self.severity = severity
+        self.message = message
+        self.stream_id = stream_id
+        self.urn = urn
+        self.urn_future: Optional['asyncio.Future[Optional[str]]'] = None
+
+
+class LogSender:
+    """
+    LogSender sends log messages to the engine from a background thread, so that logging never blocks the event loop on
+    a round trip to the engine. Messages that are part of the same stream are sent in the order they were logged, and
+    consecutive chunks of a stream are coalesced into a single request.
+    """
+
+    def __init__(self, max_queued: int = _MAX_QUEUED_MESSAGES):
+        self._max_queued = max_queued
+        self._queue: Deque[Tuple[Any, Any]] = collections.deque()
+        self._sending = 0
+        self._lock = threading.Lock()
+        # Signalled when messages are queued, and when every queued message has been sent, respectively.
+        self._queued = threading.Condition(self._lock)
+        self._sent = threading.Condition(self._lock)
+        self._thread: Optional[threading.Thread] = None
+        self._waiting: Set[_PendingMessage] = set()
+        self._streams: Dict[int, Deque[_PendingMessage]] = {}
+
+    def log(self, engine: Any, severity: int, message: str, resource: Optional['Resource'], stream_id: int):
+        """
+        Queues a message to be sent to the given engine. If a resource is given, the message is sent once the
+        resource's URN is known.
+        """
+        with self._lock:
+            stream = self._streams.get(stream_id) if stream_id != 0 else None
+            if resource is None and not stream:
+                self._put(engine, engine_pb2.LogRequest(severity=severity, message=message, urn="",
+                                                        streamId=stream_id))
+                return
+
+            pending = _PendingMessage(engine, severity, message, stream_id, "" if resource is None else None)
+            if stream_id != 0:
+                if stream is None:
+                    stream = self._streams[stream_id] = collections.deque()
+                stream.append(pending)
+            if resource is None:
+                return
+            urn_future = pending.urn_future = asyncio.ensure_future(resource.urn.future())
+            self._waiting.add(pending)
+
+        def on_urn(fut: 'asyncio.Future[Optional[str]]'):
+            # If the resource failed to register, send the message anyway rather than losing it.
+            urn = fut.result() if not fut.cancelled() and fut.exception() is None else None
+            with self._lock:
+                self._ready(pending, urn or "")
+
+        urn_future.add_done_callback(on_urn)
+
+    async def flush(self):
+        """
+        Sends every message logged so far, and waits for the engine to receive them.
+        """
+        # Wait for the URNs that messages are still waiting on. By the time we flush, the resources have normally
+        # been registered, so this only takes a moment.
+        urn_futures = [pending.urn_future for pending in list(self._waiting) if pending.urn_future is not None]
+        if urn_futures:
+            await asyncio.wait(urn_futures, timeout=_URN_FLUSH_TIMEOUT)
+        await asyncio.get_event_loop().run_in_executor(None, self.flush_sync)
+
+    def flush_sync(self):
+        """
+        Sends every message logged so far, blocking until the engine receives them. Messages still waiting for their
+        resource's URN are sent without one.
+        """
+        with self._lock:
+            for pending in list(self._waiting):
+                self._ready(pending, "")
+            while self._thread is not None and (self._queue or self._sending):
+                self._sent.wait()
+
+    def _ready(self, pending: _PendingMessage, urn: str):
+        if pending.urn is not None:
+            # The message was already released by a flush.
+            return
+        pending.urn = urn
+        self._waiting.discard(pending)
+        if pending.stream_id == 0:
+            self._put_pending(pending)
+            return
+
+        # Release the messages at the front of the stream that are now ready to go.
+        stream = self._streams[pending.stream_id]
+        while stream and stream[0].urn is not None:
+            self._put_pending(stream.popleft())
+        if not stream:
+            del self._streams[pending.stream_id]
+
+    def _put_pending(self, pending: _PendingMessage):
+        self._put(pending.engine, engine_pb2.LogRequest(severity=pending.severity, message=pending.message,
+                                                        urn=pending.urn, streamId=pending.stream_id))
+
+    def _put(self, engine: Any, req: Any):
+        # Called with the lock held, which is why this must never block: the event loop takes the lock to log.
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="pulumi-log-sender", daemon=True)
+            self._thread.start()
+            # The worst thing we can do with a log message is exit before we have the chance to send it.
+            atexit.register(self.flush_sync)
+        if len(self._queue) >= self._max_queued:
+            merged = _merge(self._queue[-1], (engine, req))
+            if merged is not None:
+                self._queue[-1] = merged
+                return
+        self._queue.append((engine, req))
+        self._queued.notify()
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._queue:
+                    self._queued.wait()
+                batch = [self._queue.popleft() for _ in range(min(len(self._queue), _MAX_BATCH_SIZE))]
+                self._sending = len(batch)
+
+            for engine, req in _coalesce(batch):
+                try:
+                    engine.Log(req)
+                except Exception: # pylint: disable=broad-except
+                    # There's nowhere left to report a failure to log, and it mustn't stop later messages.
+                    pass
+
+            with self._lock:
+                self._sending = 0
+                if not self._queue:
+                    self._sent.notify_all()
+
+
+def _merge(first: Tuple[Any, Any], second: Tuple[Any, Any]) -> Optional[Tuple[Any, Any]]:
+    """
+    Returns a single request for two consecutive chunks of the same stream, or None if they can't be merged. The engine
+    displays a stream's chunks joined together, so sending them in one request doesn't change what's displayed.
+    """
+    (first_engine, first_req), (engine, req) = first, second
+    if req.streamId == 0 or first_engine is not engine:
+        return None
+    if ((first_req.streamId, first_req.severity, first_req.urn, first_req.ephemeral) !=
+            (req.streamId, req.severity, req.urn, req.ephemeral)):
+        return None
+    return (engine, engine_pb2.LogRequest(severity=req.severity, message=first_req.message + req.message,
+                                          urn=req.urn, streamId=req.streamId, ephemeral=req.ephemeral))
+
+
+def _coalesce(batch: List[Tuple[Any, Any]]) -> List[Tuple[Any, Any]]:
+    """
+    Merges consecutive chunks of the same stream.
+    """
+    merged: List[Tuple[Any, Any]] = []
+    for item in batch:
+        merged_item = _merge(merged[-1], item) if merged else None
+        if merged_item is not None:
+            merged[-1] = merged_item
+        else:
+            merged.append(item)
+    return merged
+
+
+LOG_SENDER = LogSender()
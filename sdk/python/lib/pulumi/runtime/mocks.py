@@ -156,7 +156,8 @@ def set_mocks(mocks: Mocks,
                         project=project if project is not None else 'project',
                         stack=stack if stack is not None else 'stack',
                         dry_run=preview,
-                        test_mode_enabled=True)
+                        test_mode_enabled=True,
+                        debug_logging_enabled=True)
     configure(settings)
 
     # Make sure we have an event loop.
@@ -17,15 +17,34 @@ The Pulumi SDK runtime's Protobufs and gRPC stubs.  These are meant for internal
 """
 from __future__ import absolute_import
 
-from .analyzer_pb2 import *
-from .analyzer_pb2_grpc import *
-from .engine_pb2 import *
-from .engine_pb2_grpc import *
-from .language_pb2 import *
-from .language_pb2_grpc import *
-from .plugin_pb2 import *
-from .plugin_pb2_grpc import *
-from .provider_pb2 import *
-from .provider_pb2_grpc import *
-from .resource_pb2 import *
-from .resource_pb2_grpc import *
+import importlib
+import sys
+
+from ._members import MODULE_MEMBERS as _MODULE_MEMBERS
+
+if sys.version_info >= (3, 7):
+    from ..lazy import lazy_getattr as _lazy_getattr
+
+    # Most programs only ever need the engine, resource and provider modules, so rather than importing every module
+    # up front, each one is imported the first time something in it is needed.
+    _member_getattr = _lazy_getattr(__name__, globals(), {
+        name: f".{module_name}" for module_name, names in _MODULE_MEMBERS.items() for name in names
+    })
+
+    def __getattr__(name: str):
+        if name in _MODULE_MEMBERS:
+            return importlib.import_module(f".{name}", __name__)
+        return _member_getattr(name)
+else:
+    from .analyzer_pb2 import *
+    from .analyzer_pb2_grpc import *
+    from .engine_pb2 import *
+    from .engine_pb2_grpc import *
+    from .language_pb2 import *
+    from .language_pb2_grpc import *
+    from .plugin_pb2 import *
+    from .plugin_pb2_grpc import *
+    from .provider_pb2 import *
+    from .provider_pb2_grpc import *
+    from .resource_pb2 import *
+    from .resource_pb2_grpc import *
@@ -0,0 +1,62 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# Generated by sdk/proto/generate.sh from the generated modules. DO NOT EDIT.
+
+# The generated modules, along with the names of the messages, enums, stubs and servicers that each of them makes
+# available from this package.
+MODULE_MEMBERS = {
+    "analyzer_pb2": [
+        "ADVISORY", "AnalyzeDiagnostic", "AnalyzeRequest", "AnalyzeResponse", "AnalyzeStackRequest", "AnalyzerInfo",
+        "AnalyzerPropertyDependencies", "AnalyzerProviderResource", "AnalyzerResource", "AnalyzerResourceOptions",
+        "EnforcementLevel", "MANDATORY", "PolicyInfo"
+    ],
+    "analyzer_pb2_grpc": [
+        "AnalyzerServicer", "AnalyzerStub", "add_AnalyzerServicer_to_server"
+    ],
+    "engine_pb2": [
+        "DEBUG", "ERROR", "GetRootResourceRequest", "GetRootResourceResponse", "INFO", "LogRequest", "LogSeverity",
+        "SetRootResourceRequest", "SetRootResourceResponse", "WARNING"
+    ],
+    "engine_pb2_grpc": [
+        "EngineServicer", "EngineStub", "add_EngineServicer_to_server"
+    ],
+    "language_pb2": [
+        "GetRequiredPluginsRequest", "GetRequiredPluginsResponse", "RunRequest", "RunResponse"
+    ],
+    "language_pb2_grpc": [
+        "LanguageRuntimeServicer", "LanguageRuntimeStub", "add_LanguageRuntimeServicer_to_server"
+    ],
+    "plugin_pb2": [
+        "PluginDependency", "PluginInfo"
+    ],
+    "plugin_pb2_grpc": [
+    ],
+    "provider_pb2": [
+        "CheckFailure", "CheckRequest", "CheckResponse", "ConfigureErrorMissingKeys", "ConfigureRequest",
+        "ConfigureResponse", "CreateRequest", "CreateResponse", "DeleteRequest", "DiffRequest", "DiffResponse",
+        "ErrorResourceInitFailed", "GetSchemaRequest", "GetSchemaResponse", "InvokeRequest", "InvokeResponse",
+        "PropertyDiff", "ReadRequest", "ReadResponse", "UpdateRequest", "UpdateResponse"
+    ],
+    "provider_pb2_grpc": [
+        "ResourceProviderServicer", "ResourceProviderStub", "add_ResourceProviderServicer_to_server"
+    ],
+    "resource_pb2": [
+        "ReadResourceRequest", "ReadResourceResponse", "RegisterResourceOutputsRequest", "RegisterResourceRequest",
+        "RegisterResourceResponse", "SupportsFeatureRequest", "SupportsFeatureResponse"
+    ],
+    "resource_pb2_grpc": [
+        "ResourceMonitorServicer", "ResourceMonitorStub", "add_ResourceMonitorServicer_to_server"
+    ],
+}
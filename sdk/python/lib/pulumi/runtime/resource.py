@@ -13,9 +13,10 @@
 # limitations under the License.
 import asyncio
 import sys
+import time
 import traceback
 
-from typing import Optional, Any, Callable, List, NamedTuple, Dict, Set, Union, TYPE_CHECKING, cast
+from typing import Optional, Any, Awaitable, Callable, List, NamedTuple, Dict, Set, Union, TYPE_CHECKING, cast
 from google.protobuf import struct_pb2
 import grpc
 
@@ -67,6 +68,12 @@ class ResourceResolverOperations(NamedTuple):
     A list of aliases applied to this resource.
     """
 
+    stage_timings: Dict[str, float]
+    """
+    How long, in seconds, each stage of waiting for this resource's dependencies took. The stages overlap, as they're
+    waited for concurrently.
+    """
+
 
 # Prepares for an RPC that will manufacture a resource, and hence deals with input and output properties.
 # pylint: disable=too-many-locals
@@ -75,61 +82,81 @@ async def prepare_resource(res: 'Resource',
                            custom: bool,
                            props: 'Inputs',
                            opts: Optional['ResourceOptions']) -> ResourceResolverOperations:
-    log.debug(f"resource {props} preparing to wait for dependencies")
-    # Before we can proceed, all our dependencies must be finished.
-    explicit_urn_dependencies = []
-    if opts is not None and opts.depends_on is not None:
-        dependent_urns = list(map(lambda r: r.urn.future(), opts.depends_on))
-        explicit_urn_dependencies = await asyncio.gather(*dependent_urns)
+    if settings.is_debug_logging_enabled():
+        log.debug(f"resource {props} preparing to wait for dependencies")
+
+    # Before we can proceed, all our dependencies must be finished. None of the things we wait for depend on each
+    # other, so we start waiting for all of them at once. Each resource hands out a single future for its URN, so a
+    # resource that's referenced many times is still only waited for once.
+    stage_timings: Dict[str, float] = {}
+
+    async def timed(stage: str, awaitable: Awaitable[Any]) -> Any:
+        start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            stage_timings[stage] = time.perf_counter() - start
+
+    async def wait_for_explicit_dependencies() -> List[str]:
+        if opts is None or opts.depends_on is None:
+            return []
+        return await asyncio.gather(*[r._resolved_urn() for r in opts.depends_on])
+
+    async def wait_for_parent() -> Optional[str]:
+        if opts is not None and opts.parent is not None:
+            return await opts.parent._resolved_urn()
+        # TODO(sean) is it necessary to check the type here?
+        if ty != "pulumi:pulumi:Stack":
+            # If no parent was provided, parent to the root resource.
+            parent = settings.get_root_resource()
+            if parent is not None:
+                return await parent._resolved_urn()
+        return ""
+
+    async def wait_for_provider() -> Optional[str]:
+        if not custom or opts is None or opts.provider is None:
+            return None
+        # If we were given a provider, wait for it to resolve and construct a provider reference from it.
+        return await opts.provider._resolved_provider_ref()
+
+    async def wait_for_aliases() -> List[Optional[str]]:
+        # Note that we use `res._aliases` instead of `opts.aliases` as the former has been processed in the Resource
+        # constructor prior to calling `register_resource` - both adding new inherited aliases and simplifying aliases
+        # down to URNs.
+        alias_vals = await asyncio.gather(*[Output.from_input(alias).future() for alias in res._aliases])
+        aliases: List[Optional[str]] = []
+        for alias_val in alias_vals:
+            if not alias_val in aliases:
+                aliases.append(alias_val)
+        return aliases
 
     # Serialize out all our props to their final values.  In doing so, we'll also collect all
     # the Resources pointed to by any Dependency objects we encounter, adding them to 'implicit_dependencies'.
     property_dependencies_resources: Dict[str, List['Resource']] = {}
-    serialized_props = await rpc.serialize_properties(props, property_dependencies_resources, res.translate_input_property)
-
-    # Wait for our parent to resolve
-    parent_urn: Optional[str] = ""
-    if opts is not None and opts.parent is not None:
-        parent_urn = await opts.parent.urn.future()
-    # TODO(sean) is it necessary to check the type here?
-    elif ty != "pulumi:pulumi:Stack":
-        # If no parent was provided, parent to the root resource.
-        parent = settings.get_root_resource()
-        if parent is not None:
-            parent_urn = await parent.urn.future()
-
-    # Construct the provider reference, if we were given a provider to use.
-    provider_ref = None
-    if custom and opts is not None and opts.provider is not None:
-        provider = opts.provider
+    serialized_props, explicit_urn_dependencies, parent_urn, provider_ref, aliases = await asyncio.gather(
+        timed("properties", rpc.serialize_properties(props, property_dependencies_resources,
+                                                     rpc.input_name_translator(res))),
+        timed("dependencies", wait_for_explicit_dependencies()),
+        timed("parent", wait_for_parent()),
+        timed("provider", wait_for_provider()),
+        timed("aliases", wait_for_aliases()),
+    )
 
-        # If we were given a provider, wait for it to resolve and construct a provider reference from it.
-        # A provider reference is a well-known string (two ::-separated values) that the engine interprets.
-        provider_urn = await provider.urn.future()
-        provider_id = await provider.id.future() or rpc.UNKNOWN
-        provider_ref = f"{provider_urn}::{provider_id}"
+    # The resources our properties depend on are only known once they've been serialized.
+    start = time.perf_counter()
+    await asyncio.gather(*[dep._resolved_urn() for deps in property_dependencies_resources.values() for dep in deps])
+    stage_timings["property_dependencies"] = time.perf_counter() - start
 
     dependencies = set(explicit_urn_dependencies)
     property_dependencies: Dict[str, List[Optional[str]]] = {}
     for key, deps in property_dependencies_resources.items():
-        urns = set()
-        for dep in deps:
-            urn = await dep.urn.future()
-            urns.add(urn)
-            dependencies.add(urn)
+        urns = {dep._resolved_urn().result() for dep in deps}
+        dependencies.update(urns)
         property_dependencies[key] = list(urns)
 
-    # Wait for all aliases. Note that we use `res._aliases` instead of `opts.aliases` as the
-    # former has been processed in the Resource constructor prior to calling
-    # `register_resource` - both adding new inherited aliases and simplifying aliases down
-    # to URNs.
-    aliases: List[Optional[str]] = []
-    for alias in res._aliases:
-        alias_val = await Output.from_input(alias).future()
-        if not alias_val in aliases:
-            aliases.append(alias_val)
-
-    log.debug(f"resource {props} prepared")
+    if settings.is_debug_logging_enabled():
+        timings = ", ".join(f"{stage} {seconds * 1000:.1f}ms" for stage, seconds in stage_timings.items())
+        log.debug(f"resource {props} prepared ({timings})")
     return ResourceResolverOperations(
         parent_urn,
         serialized_props,
@@ -137,6 +164,7 @@ async def prepare_resource(res: 'Resource',
         provider_ref,
         property_dependencies,
         aliases,
+        stage_timings,
     )
 
 # pylint: disable=too-many-locals,too-many-statements
@@ -246,7 +274,7 @@ def read_resource(res: 'CustomResource', ty: str, name: str, props: 'Inputs', op
                     details = exn.details()
                 raise Exception(details)
 
-            resp = await asyncio.get_event_loop().run_in_executor(None, do_rpc_call)
+            resp = await settings.call_monitor(do_rpc_call)
 
         except Exception as exn:
             log.debug(
@@ -263,6 +291,7 @@ def read_resource(res: 'CustomResource', ty: str, name: str, props: 'Inputs', op
 
     asyncio.ensure_future(RPC_MANAGER.do_rpc("read resource", do_read)())
 
+
 # pylint: disable=too-many-locals,too-many-statements
 
 
@@ -409,7 +438,7 @@ def register_resource(res: 'Resource', ty: str, name: str, custom: bool, props:
                     details = exn.details()
                 raise Exception(details)
 
-            resp = await asyncio.get_event_loop().run_in_executor(None, do_rpc_call)
+            resp = await settings.call_monitor(do_rpc_call)
         except Exception as exn:
             log.debug(
                 f"exception when preparing or executing rpc: {traceback.format_exc()}")
@@ -438,8 +467,8 @@ def register_resource_outputs(res: 'Resource', outputs: 'Union[Inputs, Output[In
     async def do_register_resource_outputs():
         urn = await res.urn.future()
         serialized_props = await rpc.serialize_properties(outputs, {})
-        log.debug(
-            f"register resource outputs prepared: urn={urn}, props={serialized_props}")
+        if settings.is_debug_logging_enabled():
+            log.debug(f"register resource outputs prepared: urn={urn}, props={serialized_props}")
         monitor = settings.get_monitor()
         req = resource_pb2.RegisterResourceOutputsRequest(
             urn=urn, outputs=serialized_props)
@@ -461,9 +490,9 @@ def register_resource_outputs(res: 'Resource', outputs: 'Union[Inputs, Output[In
                 details = exn.details()
             raise Exception(details)
 
-        await asyncio.get_event_loop().run_in_executor(None, do_rpc_call)
-        log.debug(
-            f"resource registration successful: urn={urn}, props={serialized_props}")
+        await settings.call_monitor(do_rpc_call)
+        if settings.is_debug_logging_enabled():
+            log.debug(f"resource registration successful: urn={urn}, props={serialized_props}")
 
     asyncio.ensure_future(RPC_MANAGER.do_rpc(
         "register resource outputs", do_register_resource_outputs)())
@@ -18,7 +18,8 @@ out of RPC calls.
 import asyncio
 import functools
 import inspect
-from typing import List, Any, Callable, Dict, Optional, TYPE_CHECKING, cast
+import weakref
+from typing import List, Any, Awaitable, Callable, Dict, Optional, Set, TYPE_CHECKING, cast
 
 from google.protobuf import struct_pb2
 import six
@@ -61,19 +62,36 @@ async def serialize_properties(inputs: 'Inputs',
     Serializes an arbitrary Input bag into a Protobuf structure, keeping track of the list
     of dependent resources in the `deps` list. Serializing properties is inherently async
     because it awaits any futures that are contained transitively within the input bag.
+
+    Properties are serialized concurrently, so independent Outputs in the bag resolve in parallel. The resulting
+    struct and dependency map are nonetheless populated in the bag's key order.
     """
+    keys = list(inputs.keys())
+    key_deps: List[List['Resource']] = [[] for _ in keys]
+    results: List[Any] = [None] * len(keys)
+
+    # Plain values can be serialized right away; only the rest need to be awaited.
+    pending: List[int] = []
+    for i, k in enumerate(keys):
+        plain = _serialize_plain(inputs[k], input_transformer)
+        if plain is _NOT_PLAIN:
+            pending.append(i)
+        else:
+            results[i] = plain
+    if pending:
+        resolved = await asyncio.gather(*[
+            _serialize_property(inputs[keys[i]], key_deps[i], input_transformer) for i in pending
+        ])
+        for i, result in zip(pending, resolved):
+            results[i] = result
+
     struct = struct_pb2.Struct()
-    for k, v in inputs.items():
-        deps: List['Resource'] = []
-        result = await serialize_property(v, deps, input_transformer)
+    for k, deps, result in zip(keys, key_deps, results):
         # We treat properties that serialize to None as if they don't exist.
         if result is not None:
             # While serializing to a pb struct, we must "translate" all key names to be what the
             # engine is going to expect. Resources provide the "transform" function for doing this.
-            translated_name = k
-            if input_transformer is not None:
-                translated_name = input_transformer(k)
-                log.debug(f"top-level input property translated: {k} -> {translated_name}")
+            translated_name = input_transformer(k) if input_transformer is not None else k
             # pylint: disable=unsupported-assignment-operation
             struct[translated_name] = result
             property_deps[translated_name] = deps
@@ -81,72 +99,181 @@ async def serialize_properties(inputs: 'Inputs',
     return struct
 
 
-# pylint: disable=too-many-return-statements, too-many-branches
-async def serialize_property(value: 'Input[Any]',
-                             deps: List['Resource'],
-                             input_transformer: Optional[Callable[[str], str]] = None) -> Any:
+_NOT_PLAIN = object()
+"""Returned by _serialize_plain for values that need the full asynchronous serializer."""
+
+_PLAIN_TYPES = six.string_types + _INT_OR_FLOAT + (bool,)
+
+
+def _serialize_plain(value: Any, input_transformer: Optional[Callable[[str], str]]) -> Any:
     """
-    Serializes a single Input into a form suitable for remoting to the engine, awaiting
-    any futures required to do so.
+    Synchronously serializes a value that is made up only of plain Python values: strings, numbers, booleans, None, and
+    lists and dicts of those. Large generated inputs such as policy documents or tag maps usually look like this, and
+    don't need an awaitable per leaf. Returns _NOT_PLAIN if the value contains anything else (an Output, awaitable,
+    resource, asset or unknown), in which case it must go through the asynchronous serializer instead.
     """
+    if value is None or isinstance(value, _PLAIN_TYPES):
+        return value
+
     if isinstance(value, list):
         props = []
         for elem in value:
-            props.append(await serialize_property(elem, deps, input_transformer))
-
+            prop = _serialize_plain(elem, input_transformer)
+            if prop is _NOT_PLAIN:
+                return _NOT_PLAIN
+            props.append(prop)
         return props
 
-    if known_types.is_unknown(value):
-        return UNKNOWN
+    if isinstance(value, dict):
+        obj = {}
+        for k, v in value.items():
+            prop = _serialize_plain(v, input_transformer)
+            if prop is _NOT_PLAIN:
+                return _NOT_PLAIN
+            obj[input_transformer(k) if input_transformer is not None else k] = prop
+        return obj
 
-    if known_types.is_custom_resource(value):
-        resource = cast('CustomResource', value)
-        deps.append(resource)
-        return await serialize_property(resource.id, deps, input_transformer)
-
-    if known_types.is_asset(value):
-        # Serializing an asset requires the use of a magical signature key, since otherwise it would
-        # look like any old weakly typed object/map when received by the other side of the RPC
-        # boundary.
-        obj = {
-            _special_sig_key: _special_asset_sig
-        }
+    return _NOT_PLAIN
 
-        if hasattr(value, "path"):
-            file_asset = cast('FileAsset', value)
-            obj["path"] = await serialize_property(file_asset.path, deps, input_transformer)
-        elif hasattr(value, "text"):
-            str_asset = cast('StringAsset', value)
-            obj["text"] = await serialize_property(str_asset.text, deps, input_transformer)
-        elif hasattr(value, "uri"):
-            remote_asset = cast('RemoteAsset', value)
-            obj["uri"] = await serialize_property(remote_asset.uri, deps, input_transformer)
+
+async def _serialize_all(values: List[Any],
+                         deps: List['Resource'],
+                         input_transformer: Optional[Callable[[str], str]]) -> List[Any]:
+    """
+    Serializes a list of sibling values concurrently. Each sibling collects its dependencies separately, and they are
+    appended to `deps` in sibling order once all of them have finished, so the result does not depend on the order in
+    which the siblings happened to resolve.
+    """
+    results: List[Any] = [None] * len(values)
+    pending: List[int] = []
+    for i, v in enumerate(values):
+        plain = _serialize_plain(v, input_transformer)
+        if plain is _NOT_PLAIN:
+            pending.append(i)
         else:
-            raise AssertionError(f"unknown asset type: {value}")
+            results[i] = plain
+
+    if len(pending) == 1:
+        results[pending[0]] = await _serialize_property(values[pending[0]], deps, input_transformer)
+    elif pending:
+        sibling_deps: List[List['Resource']] = [[] for _ in pending]
+        resolved = await asyncio.gather(*[
+            _serialize_property(values[i], d, input_transformer) for i, d in zip(pending, sibling_deps)
+        ])
+        for i, d, result in zip(pending, sibling_deps, resolved):
+            results[i] = result
+            deps.extend(d)
+    return results
 
-        return obj
 
-    if known_types.is_archive(value):
-        # Serializing an archive requires the use of a magical signature key, since otherwise it
-        # would look like any old weakly typed object/map when received by the other side of the RPC
-        # boundary.
-        obj = {
-            _special_sig_key: _special_archive_sig
+async def serialize_property(value: 'Input[Any]',
+                             deps: List['Resource'],
+                             input_transformer: Optional[Callable[[str], str]] = None) -> Any:
+    """
+    Serializes a single Input into a form suitable for remoting to the engine, awaiting
+    any futures required to do so.
+    """
+    plain = _serialize_plain(value, input_transformer)
+    if plain is not _NOT_PLAIN:
+        return plain
+    return await _serialize_property(value, deps, input_transformer)
+
+
+async def _serialize_unknown(_value: Any, _kind: str, _deps: List['Resource'],
+                             _input_transformer: Optional[Callable[[str], str]]) -> Any:
+    return UNKNOWN
+
+
+async def _serialize_custom_resource(value: Any, _kind: str, deps: List['Resource'],
+                                     input_transformer: Optional[Callable[[str], str]]) -> Any:
+    resource = cast('CustomResource', value)
+    deps.append(resource)
+    return await serialize_property(resource.id, deps, input_transformer)
+
+
+_ASSET_FIELDS: Dict[str, str] = {
+    "file_asset": "path",
+    "string_asset": "text",
+    "remote_asset": "uri",
+    "asset_archive": "assets",
+    "file_archive": "path",
+    "remote_archive": "uri",
+}
+"""The field that holds the contents of each concrete kind of asset and archive."""
+
+
+async def _serialize_asset_or_archive(value: Any, kind: str, deps: List['Resource'],
+                                      input_transformer: Optional[Callable[[str], str]]) -> Any:
+    # Serializing an asset or archive requires the use of a magical signature key, since otherwise it would look
+    # like any old weakly typed object/map when received by the other side of the RPC boundary.
+    is_asset = known_types.is_asset(value)
+    obj = {
+        _special_sig_key: _special_asset_sig if is_asset else _special_archive_sig
+    }
+
+    field = _ASSET_FIELDS.get(kind)
+    if field is None:
+        # This is a subclass of Asset or Archive that we don't know about; look for a field we recognize.
+        fields = ["path", "text", "uri"] if is_asset else ["assets", "path", "uri"]
+        field = next((f for f in fields if hasattr(value, f)), None)
+        if field is None:
+            raise AssertionError(f"unknown {'asset' if is_asset else 'archive'} type: {value}")
+
+    obj[field] = await serialize_property(getattr(value, field), deps, input_transformer)
+    return obj
+
+
+async def _serialize_output(value: Any, _kind: str, deps: List['Resource'],
+                            input_transformer: Optional[Callable[[str], str]]) -> Any:
+    output = cast('Output', value)
+    value, is_known, is_secret, value_resources, _ = await output._resolve()
+    deps.extend(value_resources)
+
+    # When serializing an Output, we will either serialize it as its resolved value or the
+    # "unknown value" sentinel. We will do the former for all outputs created directly by user
+    # code (such outputs always resolve isKnown to true) and for any resource outputs that were
+    # resolved with known values. The value is serialized either way so that the resources it
+    # depends on are recorded.
+    value = await serialize_property(value, deps, input_transformer)
+    if not is_known:
+        return UNKNOWN
+    if is_secret and await settings.monitor_supports_secrets():
+        # Serializing an output with a secret value requires the use of a magical signature key,
+        # which the engine detects.
+        return {
+            _special_sig_key: _special_secret_sig,
+            "value": value
         }
+    return value
 
-        if hasattr(value, "assets"):
-            asset_archive = cast('AssetArchive', value)
-            obj["assets"] = await serialize_property(asset_archive.assets, deps, input_transformer)
-        elif hasattr(value, "path"):
-            file_archive = cast('FileArchive', value)
-            obj["path"] = await serialize_property(file_archive.path, deps, input_transformer)
-        elif hasattr(value, "uri"):
-            remote_archive = cast('RemoteArchive', value)
-            obj["uri"] = await serialize_property(remote_archive.uri, deps, input_transformer)
-        else:
-            raise AssertionError(f"unknown archive type: {value}")
 
-        return obj
+_KIND_SERIALIZERS: Dict[str, Callable[[Any, str, List['Resource'], Optional[Callable[[str], str]]], Awaitable[Any]]] = {
+    "unknown": _serialize_unknown,
+    "custom_resource": _serialize_custom_resource,
+    "asset": _serialize_asset_or_archive,
+    "file_asset": _serialize_asset_or_archive,
+    "string_asset": _serialize_asset_or_archive,
+    "remote_asset": _serialize_asset_or_archive,
+    "archive": _serialize_asset_or_archive,
+    "asset_archive": _serialize_asset_or_archive,
+    "file_archive": _serialize_asset_or_archive,
+    "remote_archive": _serialize_asset_or_archive,
+    "output": _serialize_output,
+}
+"""Serializers for each kind of known type, as classified by `known_types.kind_of`."""
+
+
+async def _serialize_property(value: 'Input[Any]',
+                              deps: List['Resource'],
+                              input_transformer: Optional[Callable[[str], str]] = None) -> Any:
+    if isinstance(value, list):
+        return await _serialize_all(value, deps, input_transformer)
+
+    kind = known_types.kind_of(value)
+    if kind is not None:
+        serializer = _KIND_SERIALIZERS.get(kind)
+        if serializer is not None:
+            return await serializer(value, kind, deps, input_transformer)
 
     if inspect.isawaitable(value):
         # Coroutines and Futures are both awaitable. Coroutines need to be scheduled.
@@ -159,37 +286,13 @@ async def serialize_property(value: 'Input[Any]',
         future_return = await asyncio.ensure_future(awaitable)
         return await serialize_property(future_return, deps, input_transformer)
 
-    if known_types.is_output(value):
-        output = cast('Output', value)
-        value_resources = await output.resources()
-        deps.extend(value_resources)
-
-        # When serializing an Output, we will either serialize it as its resolved value or the
-        # "unknown value" sentinel. We will do the former for all outputs created directly by user
-        # code (such outputs always resolve isKnown to true) and for any resource outputs that were
-        # resolved with known values.
-        is_known = await output._is_known
-        is_secret = await output._is_secret
-        value = await serialize_property(output.future(), deps, input_transformer)
-        if not is_known:
-            return UNKNOWN
-        if is_secret and await settings.monitor_supports_secrets():
-            # Serializing an output with a secret value requires the use of a magical signature key,
-            # which the engine detects.
-            return {
-                _special_sig_key: _special_secret_sig,
-                "value": value
-            }
-        return value
-
     if isinstance(value, dict):
+        keys = list(value.keys())
+        values = await _serialize_all([value[k] for k in keys], deps, input_transformer)
+
         obj = {}
-        for k, v in value.items():
-            transformed_key = k
-            if input_transformer is not None:
-                transformed_key = input_transformer(k)
-                log.debug(f"transforming input property: {k} -> {transformed_key}")
-            obj[transformed_key] = await serialize_property(v, deps, input_transformer)
+        for k, v in zip(keys, values):
+            obj[input_transformer(k) if input_transformer is not None else k] = v
 
         return obj
 
@@ -209,45 +312,10 @@ def deserialize_properties(props_struct: struct_pb2.Struct, keep_unknowns: Optio
     # https://developers.google.com/protocol-buffers/docs/reference/python-generated
     #
     # We assume that we are deserializing properties that we got from a Resource RPC endpoint,
-    # which has type `Struct` in our gRPC proto definition.
-    if _special_sig_key in props_struct:
-        if props_struct[_special_sig_key] == _special_asset_sig:
-            # This is an asset. Re-hydrate this object into an Asset.
-            if "path" in props_struct:
-                return known_types.new_file_asset(props_struct["path"])
-            if "text" in props_struct:
-                return known_types.new_string_asset(props_struct["text"])
-            if "uri" in props_struct:
-                return known_types.new_remote_asset(props_struct["uri"])
-            raise AssertionError("Invalid asset encountered when unmarshaling resource property")
-        if props_struct[_special_sig_key] == _special_archive_sig:
-            # This is an archive. Re-hydrate this object into an Archive.
-            if "assets" in props_struct:
-                return known_types.new_asset_archive(deserialize_property(props_struct["assets"]))
-            if "path" in props_struct:
-                return known_types.new_file_archive(props_struct["path"])
-            if "uri" in props_struct:
-                return known_types.new_remote_archive(props_struct["uri"])
-            raise AssertionError("Invalid archive encountered when unmarshaling resource property")
-        if props_struct[_special_sig_key] == _special_secret_sig:
-            return {
-                _special_sig_key: _special_secret_sig,
-                "value": deserialize_property(props_struct["value"])
-            }
-
-        raise AssertionError("Unrecognized signature when unmarshaling resource property")
-
-    # Struct is duck-typed like a dictionary, so we can iterate over it in the normal ways. Note
-    # that if the struct had any secret properties, we push the secretness of the object up to us
-    # since we can only set secret outputs on top level properties.
-    output = {}
-    for k, v in list(props_struct.items()):
-        value = deserialize_property(v, keep_unknowns)
-        # We treat values that deserialize to "None" as if they don't exist.
-        if value is not None:
-            output[k] = value
-
-    return output
+    # which has type `Struct` in our gRPC proto definition. Unlike nested structs, secret
+    # properties are not pushed up to the top-level struct: they stay wrapped, since we can only
+    # set secret outputs on top level properties.
+    return _deserialize(props_struct, keep_unknowns, True)
 
 def is_rpc_secret(value: Any) -> bool:
     """
@@ -269,42 +337,132 @@ def deserialize_property(value: Any, keep_unknowns: Optional[bool] = None) -> An
     Deserializes a single protobuf value (either `Struct` or `ListValue`) into idiomatic
     Python values.
     """
-    if value == UNKNOWN:
-        return known_types.new_unknown() if settings.is_dry_run() or keep_unknowns else None
+    return _deserialize(value, keep_unknowns, False)
 
-    # ListValues are projected to lists
-    if isinstance(value, struct_pb2.ListValue):
-        # values has no __iter__ defined but this works.
-        values = [deserialize_property(v, keep_unknowns) for v in value] # type: ignore
-        # If there are any secret values in the list, push the secretness "up" a level by returning
-        # an array that is marked as a secret with raw values inside.
-        if any(is_rpc_secret(v) for v in values):
-            return {
-                _special_sig_key: _special_secret_sig,
-                "value": [unwrap_rpc_secret(v) for v in values]
-            }
-
-        return values
 
+class _DeserializeFrame:
+    """
+    A Struct or ListValue that is partway through being deserialized.
+    """
+    __slots__ = ("items", "output", "key", "keep_unknowns", "top_level", "is_secret")
+
+    def __init__(self, items: Any, output: Any, keep_unknowns: Optional[bool], top_level: bool, is_secret: bool):
+        self.items = items
+        self.output = output
+        self.key: Optional[str] = None
+        self.keep_unknowns = keep_unknowns
+        self.top_level = top_level
+        self.is_secret = is_secret
+
+    def add(self, value: Any, is_secret: bool):
+        output = self.output
+        if isinstance(output, list):
+            output.append(value)
+        elif output is None:
+            # The value of a secret struct.
+            self.output = value
+        elif value is not None or is_secret:
+            # We treat values that deserialize to "None" as if they don't exist.
+            if is_secret and self.top_level:
+                value = {_special_sig_key: _special_secret_sig, "value": value}
+                is_secret = False
+            output[self.key] = value
+        # If there are any secret values in this struct or list, push the secretness "up" a level.
+        self.is_secret = self.is_secret or is_secret
+
+
+_PENDING = object()
+
+
+def _deserialize_start(value: Any, keep_unknowns: Optional[bool], top_level: bool,
+                       stack: List[_DeserializeFrame]) -> Any:
+    """
+    Deserializes `value` if it is a scalar or an asset, returning it. Otherwise, pushes a frame for it onto `stack`
+    and returns _PENDING.
+    """
     # Structs are projected to dictionaries
     if isinstance(value, struct_pb2.Struct):
-        props = deserialize_properties(value, keep_unknowns)
-        # If there are any secret values in the dictionary, push the secretness "up" a level by returning
-        # a dictionary that is marked as a secret with raw values inside. Note: thje isinstance check here is
-        # important, since deserialize_properties will return either a dictionary or a concret type (in the case of
-        # assets).
-        if isinstance(props, dict) and any(is_rpc_secret(v) for v in props.values()):
-            return {
-                _special_sig_key: _special_secret_sig,
-                "value": {k: unwrap_rpc_secret(v) for k, v in props.items()}
-            }
+        if _special_sig_key not in value.fields:
+            stack.append(_DeserializeFrame(iter(value.fields.items()), {}, keep_unknowns, top_level, False))
+            return _PENDING
 
-        return props
+        sig = value[_special_sig_key]
+        if sig == _special_asset_sig:
+            # This is an asset. Re-hydrate this object into an Asset.
+            if "path" in value:
+                return known_types.new_file_asset(value["path"])
+            if "text" in value:
+                return known_types.new_string_asset(value["text"])
+            if "uri" in value:
+                return known_types.new_remote_asset(value["uri"])
+            raise AssertionError("Invalid asset encountered when unmarshaling resource property")
+        if sig == _special_archive_sig:
+            # This is an archive. Re-hydrate this object into an Archive.
+            if "assets" in value:
+                return known_types.new_asset_archive(deserialize_property(value["assets"]))
+            if "path" in value:
+                return known_types.new_file_archive(value["path"])
+            if "uri" in value:
+                return known_types.new_remote_archive(value["uri"])
+            raise AssertionError("Invalid archive encountered when unmarshaling resource property")
+        if sig == _special_secret_sig:
+            stack.append(_DeserializeFrame(iter([value.fields["value"]]), None, None, False, True))
+            return _PENDING
+
+        raise AssertionError("Unrecognized signature when unmarshaling resource property")
+
+    # ListValues are projected to lists
+    if isinstance(value, struct_pb2.ListValue):
+        stack.append(_DeserializeFrame(iter(value.values), [], keep_unknowns, False, False))
+        return _PENDING
+
+    if value == UNKNOWN:
+        return known_types.new_unknown() if settings.is_dry_run() or keep_unknowns else None
 
     # Everything else is identity projected.
     return value
 
 
+def _deserialize(root: Any, keep_unknowns: Optional[bool], top_level: bool,
+                 translate: Optional[Callable[[str], str]] = None) -> Any:
+    # Deserialize with an explicit stack of partially built values rather than by recursing, so that deeply nested
+    # values can't overflow the Python stack. Each value is built in a single pass, tracking whether it contains any
+    # secrets as it goes. If given, `translate` is applied to the keys of every struct as it is built.
+    stack: List[_DeserializeFrame] = []
+    value = _deserialize_start(root, keep_unknowns, top_level, stack)
+    is_secret = False
+    while stack:
+        frame = stack[-1]
+        is_struct = isinstance(frame.output, dict)
+        for item in frame.items:
+            if is_struct:
+                key, item = item
+                frame.key = key if translate is None else translate(key)
+            # Frames iterate the raw `struct_pb2.Value`s, skipping the Struct and ListValue accessors that unpack each
+            # of them on our behalf.
+            kind = item.WhichOneof("kind")
+            if kind in ("struct_value", "list_value"):
+                item_value = _deserialize_start(getattr(item, kind), frame.keep_unknowns, False, stack)
+                if item_value is _PENDING:
+                    break
+            elif kind == "null_value":
+                item_value = None
+            else:
+                item_value = getattr(item, kind)
+                if item_value == UNKNOWN:
+                    item_value = known_types.new_unknown() if settings.is_dry_run() or frame.keep_unknowns else None
+            frame.add(item_value, False)
+        else:
+            stack.pop()
+            value, is_secret = frame.output, frame.is_secret
+            if stack:
+                stack[-1].add(value, is_secret)
+
+    if is_secret:
+        return {_special_sig_key: _special_secret_sig, "value": value}
+    return value
+
+
 Resolver = Callable[[Any, bool, bool, Optional[Exception]], None]
 """
 A Resolver is a function that takes four arguments:
@@ -371,29 +529,105 @@ def translate_output_properties(res: 'Resource', output: Any) -> Any:
 
     If output is a primitive (i.e. not a dict or list), the value is returned without modification.
     """
+    translate = output_name_translator(res)
+    if translate is None:
+        return output
+
+    return _translate_keys(translate, output)
+
+
+def _translate_keys(translate: Callable[[str], str], output: Any) -> Any:
     if isinstance(output, dict):
-        return {res.translate_output_property(k): translate_output_properties(res, v) for k, v in output.items()}
+        return {translate(k): _translate_keys(translate, v) for k, v in output.items()}
 
     if isinstance(output, list):
-        return [translate_output_properties(res, v) for v in output]
+        return [_translate_keys(translate, v) for v in output]
 
     return output
 
 
 def contains_unknowns(val: Any) -> bool:
-    def impl(val: Any, stack: List[Any]) -> bool:
+    # Walk the value iteratively, visiting each list and dict only once (values may share or even contain
+    # themselves).
+    seen: Set[int] = set()
+    stack = [val]
+    while stack:
+        val = stack.pop()
         if known_types.is_unknown(val):
             return True
+        if isinstance(val, (dict, list)) and id(val) not in seen:
+            seen.add(id(val))
+            stack.extend(val.values() if isinstance(val, dict) else val)
+    return False
+
+
+_translated_input_names: 'weakref.WeakKeyDictionary[type, Optional[Dict[str, str]]]' = weakref.WeakKeyDictionary()
+"""
+Input property names translated by each resource class whose translations are memoized, keyed by the untranslated
+name. None for classes that don't translate their input property names.
+"""
+
+_translated_output_names: 'weakref.WeakKeyDictionary[type, Optional[Dict[str, str]]]' = weakref.WeakKeyDictionary()
+"""
+Output property names translated by each resource class whose translations are memoized, keyed by the untranslated
+name. None for classes that don't translate their output property names.
+"""
+
 
-        if not any([x is val for x in stack]):
-            stack.append(val)
-            if isinstance(val, dict):
-                return any([impl(x, stack) for x in val.values()])
-            if isinstance(val, list):
-                return any([impl(x, stack) for x in val])
-        return False
+def _name_translator(res: 'Resource',
+                     translated: 'weakref.WeakKeyDictionary[type, Optional[Dict[str, str]]]',
+                     method: str,
+                     table: str,
+                     kind: str) -> Optional[Callable[[str], str]]:
+    from ..resource import Resource # pylint: disable=import-outside-toplevel
 
-    return impl(val, [])
+    cls = type(res)
+    translate_property: Callable[[str], str] = getattr(res, method)
+    overridden = getattr(cls, method) is not getattr(Resource, method)
+    if overridden and not getattr(cls, "_translations_are_static", False):
+        # An overriding method may depend on the resource itself, so its translations can't be shared.
+        return translate_property
+
+    if cls not in translated:
+        if overridden:
+            translated[cls] = {}
+        else:
+            # The default translation just looks names up in the class's static name table, so start from a copy.
+            names_table = getattr(cls, table)
+            translated[cls] = dict(names_table) if names_table is not None else None
+    names = translated[cls]
+    if names is None:
+        return None
+    memo: Dict[str, str] = names
+
+    def translate(name: str) -> str:
+        translated_name = memo.get(name)
+        if translated_name is None:
+            translated_name = memo[name] = translate_property(name)
+            log.debug(f"{kind} property translated: {name} -> {translated_name}")
+        return translated_name
+
+    return translate
+
+
+def input_name_translator(res: 'Resource') -> Optional[Callable[[str], str]]:
+    """
+    Returns a function that translates input property names using `res.translate_input_property`. Translations are
+    remembered for every resource of the same class, unless the class overrides the method without declaring its
+    translations static. Returns None if `res` does not translate its input properties.
+    """
+    return _name_translator(res, _translated_input_names, "translate_input_property", "_input_property_names",
+                            "input")
+
+
+def output_name_translator(res: 'Resource') -> Optional[Callable[[str], str]]:
+    """
+    Returns a function that translates output property names using `res.translate_output_property`. Translations are
+    remembered for every resource of the same class, unless the class overrides the method without declaring its
+    translations static. Returns None if `res` does not translate its output properties.
+    """
+    return _name_translator(res, _translated_output_names, "translate_output_property", "_output_property_names",
+                            "incoming output")
 
 
 async def resolve_outputs(res: 'Resource',
@@ -403,22 +637,17 @@ async def resolve_outputs(res: 'Resource',
 
     # Produce a combined set of property states, starting with inputs and then applying
     # outputs.  If the same property exists in the inputs and outputs states, the output wins.
-    all_properties = {}
-    for key, value in deserialize_properties(outputs).items():
-        # Outputs coming from the provider are NOT translated. Do so here.
-        translated_key = res.translate_output_property(key)
-        translated_value = translate_output_properties(res, value)
-        log.debug(f"incoming output property translated: {key} -> {translated_key}")
-        log.debug(f"incoming output value translated: {value} -> {translated_value}")
-        all_properties[translated_key] = translated_value
+    # Outputs coming from the provider are NOT translated, so we translate their names as we deserialize them.
+    translate = output_name_translator(res)
+    all_properties = _deserialize(outputs, None, True, translate)
 
     if not settings.is_dry_run() or settings.is_legacy_apply_enabled():
-        for key, value in list(serialized_props.items()):
-            translated_key = res.translate_output_property(key)
+        for key, value in serialized_props.items():
+            translated_key = key if translate is None else translate(key)
             if translated_key not in all_properties:
                 # input prop the engine didn't give us a final value for.Just use the value passed into the resource by
                 # the user.
-                all_properties[translated_key] = translate_output_properties(res, deserialize_property(value))
+                all_properties[translated_key] = _deserialize(value, None, False, translate)
 
     for key, value in all_properties.items():
         # Skip "id" and "urn", since we handle those specially.
@@ -26,9 +26,14 @@ class RPCManager:
     outstanding RPCs.
     """
 
-    rpcs: List[Awaitable]
+    count: int
     """
-    The active RPCs.
+    The number of RPCs that have been started and have not yet finished.
+    """
+
+    peak_count: int
+    """
+    The largest number of RPCs that have been outstanding at once.
     """
 
     unhandled_exception: Optional[Exception]
@@ -42,9 +47,11 @@ class RPCManager:
     """
 
     def __init__(self):
-        self.rpcs = []
+        self.count = 0
+        self.peak_count = 0
         self.unhandled_exception = None
         self.exception_traceback = None
+        self._idle_waiters: List[asyncio.Future] = []
 
     def do_rpc(self, name: str, rpc_function: Callable[..., Awaitable[Tuple[Any, Exception]]]) -> Callable[..., Awaitable[Tuple[Any, Exception]]]:
         """
@@ -61,10 +68,9 @@ class RPCManager:
         async def rpc_wrapper(*args, **kwargs):
             log.debug(f"beginning rpc {name}")
 
-            rpc = asyncio.ensure_future(rpc_function(*args, **kwargs))
-            self.rpcs.append(rpc)
+            self._rpc_started()
             try:
-                result = await rpc
+                result = await rpc_function(*args, **kwargs)
                 exception = None
             except Exception as exn:
                 log.debug(f"RPC failed with exception:")
@@ -74,11 +80,36 @@ class RPCManager:
                     self.exception_traceback = sys.exc_info()[2]
                 result = None
                 exception = exn
+            finally:
+                self._rpc_finished()
 
             return result, exception
 
         return rpc_wrapper
 
+    def _rpc_started(self):
+        self.count += 1
+        if self.count > self.peak_count:
+            self.peak_count = self.count
+
+    def _rpc_finished(self):
+        self.count -= 1
+        if self.count == 0:
+            waiters, self._idle_waiters = self._idle_waiters, []
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+    async def wait_for_idle(self):
+        """
+        Waits until there are no outstanding RPCs. Returns immediately if there are none.
+        """
+        if self.count == 0:
+            return
+        waiter = asyncio.get_event_loop().create_future()
+        self._idle_waiters.append(waiter)
+        await waiter
+
 
 RPC_MANAGER: RPCManager = RPCManager()
 """
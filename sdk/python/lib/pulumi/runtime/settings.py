@@ -16,26 +16,251 @@
 Runtime settings and configuration.
 """
 import asyncio
+import collections
+import inspect
 import os
 import sys
-from typing import Optional, Awaitable, Union, Any, TYPE_CHECKING
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Awaitable, Union, Any, Callable, Dict, Tuple, TYPE_CHECKING
 
 import grpc
 from ..runtime.proto import engine_pb2_grpc, resource_pb2, resource_pb2_grpc
 from ..errors import RunError
 
+# grpc.aio is only available in newer versions of grpcio. When it's missing, the asyncio-native monitor transport is
+# simply unavailable and we fall back to blocking stubs.
+try:
+    from grpc import aio as grpc_aio
+except ImportError:
+    grpc_aio = None
+
 if TYPE_CHECKING:
     from ..resource import Resource
 
+_MAX_RPC_PARALLELISM = 128
+"""
+The most RPCs that will be in flight at once, regardless of the requested parallelism. The CLI passes a parallelism of
+MaxInt32 when the user doesn't ask for a limit, which we can't sensibly turn into threads.
+"""
+
+
+def _rpc_parallelism(parallel: Optional[Union[int, str]]) -> int:
+    """
+    Returns the number of RPCs that may be in flight at once for the given `--parallel` setting.
+    """
+    try:
+        limit = int(parallel) if parallel is not None else 0
+    except ValueError:
+        limit = 0
+    if limit <= 0:
+        # Nothing was requested, so match the sizing of asyncio's default executor.
+        return min(32, (os.cpu_count() or 1) + 4)
+    return min(limit, _MAX_RPC_PARALLELISM)
+
+
+class RPCLimiter:
+    """
+    RPCLimiter bounds the number of RPCs to the engine that are in flight at once. Blocking RPCs run on a dedicated
+    thread pool and asyncio-native RPCs wait on a semaphore, both of which are sized by `limit`.
+    """
+
+    limit: int
+    """
+    The maximum number of RPCs that may be in flight at once.
+    """
+
+    queued: int
+    """
+    The number of RPCs that are waiting for a free slot.
+    """
+
+    in_flight: int
+    """
+    The number of RPCs that are currently executing.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self.limit = limit
+        self.queued = 0
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._semaphores: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]' = \
+            weakref.WeakKeyDictionary()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.limit)
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to the event loop they are first used on, so keep one per loop.
+        loop = asyncio.get_event_loop()
+        sem = self._semaphores.get(loop)
+        if sem is None:
+            sem = asyncio.Semaphore(self.limit)
+            self._semaphores[loop] = sem
+        return sem
+
+    def _adjust(self, queued: int, in_flight: int):
+        with self._lock:
+            self.queued += queued
+            self.in_flight += in_flight
+
+    async def run(self, do_rpc_call: Callable[[], Any]) -> Any:
+        """
+        Runs a blocking RPC on the thread pool, returning its result.
+        """
+        state = {"queued": True}
+
+        def run_rpc_call():
+            with self._lock:
+                if state["queued"]:
+                    state["queued"] = False
+                    self.queued -= 1
+                self.in_flight += 1
+            try:
+                return do_rpc_call()
+            finally:
+                self._adjust(0, -1)
+
+        self._adjust(1, 0)
+        try:
+            return await asyncio.get_event_loop().run_in_executor(self._get_executor(), run_rpc_call)
+        finally:
+            # If we were cancelled before a worker picked the call up, it will never leave the queue on its own.
+            with self._lock:
+                if state["queued"]:
+                    state["queued"] = False
+                    self.queued -= 1
+
+    def shutdown(self):
+        """
+        Stops the threads of the blocking RPC pool once the RPCs running on them finish. The pool is started again if
+        the limiter is used afterwards.
+        """
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    async def run_async(self, do_rpc_call: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Runs an asyncio-native RPC once a slot is free, returning its result. `do_rpc_call` is not called until then,
+        so that the request is not sent early.
+        """
+        sem = self._get_semaphore()
+        self._adjust(1, 0)
+        try:
+            await sem.acquire()
+        finally:
+            self._adjust(-1, 0)
+        self._adjust(0, 1)
+        try:
+            return await do_rpc_call()
+        finally:
+            self._adjust(0, -1)
+            sem.release()
+
+
+
+_MAX_CACHED_INVOKES = 1024
+"""
+The most invoke responses that the invoke cache holds on to at once.
+"""
+
+
+class InvokeCache:
+    """
+    InvokeCache remembers the responses to invokes made during a deployment, so that identical invokes share a single
+    RPC. Invokes that are made while an identical one is still in flight wait for its response rather than sending
+    their own. The least recently used responses are dropped once the cache holds `max_size` of them.
+    """
+
+    max_size: int
+    """
+    The most responses that the cache holds on to at once.
+    """
+
+    hits: int
+    """
+    The number of invokes that were served from the cache, including those that waited for an identical invoke.
+    """
+
+    misses: int
+    """
+    The number of invokes that had to be sent to the engine.
+    """
+
+    def __init__(self, max_size: int = _MAX_CACHED_INVOKES) -> None:
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'collections.OrderedDict[Any, Any]' = collections.OrderedDict()
+
+    @property
+    def hit_rate(self) -> float:
+        """
+        The fraction of invokes that were served from the cache.
+        """
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    async def get_or_invoke(self, key: Any, do_invoke: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Returns the cached response for the invoke identified by `key`, calling `do_invoke` to send the invoke if
+        there isn't one. Failed invokes aren't cached.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if not asyncio.isfuture(entry):
+                return entry
+            task = entry
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(do_invoke())
+            task.add_done_callback(lambda t: self._on_invoke_done(key, t))
+            self._entries[key] = task
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        # The invoke is shared by everyone waiting for it, including the caller that sent it, so none of them being
+        # cancelled cancels it for the others.
+        return await asyncio.shield(task)
+
+    def _on_invoke_done(self, key: Any, task: 'asyncio.Future[Any]') -> None:
+        # Retrieve the exception before anything else, even if the invoke has since been evicted, so it isn't reported
+        # as never retrieved when nobody's left waiting for the invoke.
+        failed = task.cancelled() or task.exception() is not None
+        if self._entries.get(key) is not task:
+            return
+        if failed:
+            del self._entries[key]
+        else:
+            self._entries[key] = task.result()
+
+
 class Settings:
     monitor: Optional[Union[resource_pb2_grpc.ResourceMonitorStub, Any]]
     engine: Optional[Union[engine_pb2_grpc.EngineStub, Any]]
     project: Optional[str]
     stack: Optional[str]
-    parallel: Optional[str]
+    parallel: Optional[Union[int, str]]
     dry_run: Optional[bool]
     test_mode_enabled: Optional[bool]
     legacy_apply_enabled: Optional[bool]
+    async_monitor_enabled: Optional[bool]
+    debug_logging_enabled: Optional[bool]
+    invoke_cache_enabled: Optional[bool]
+    rpc_limiter: RPCLimiter
+    invoke_cache: InvokeCache
+    feature_support: Dict[str, bool]
+    feature_probes: Dict[str, Tuple[asyncio.AbstractEventLoop, 'asyncio.Future[bool]']]
 
     """
     A bag of properties for configuring the Pulumi Python language runtime.
@@ -45,10 +270,13 @@ class Settings:
                  engine: Optional[Union[str, Any]] = None,
                  project: Optional[str] = None,
                  stack: Optional[str] = None,
-                 parallel: Optional[str] = None,
+                 parallel: Optional[Union[int, str]] = None,
                  dry_run: Optional[bool] = None,
                  test_mode_enabled: Optional[bool] = None,
-                 legacy_apply_enabled: Optional[bool] = None):
+                 legacy_apply_enabled: Optional[bool] = None,
+                 async_monitor_enabled: Optional[bool] = None,
+                 debug_logging_enabled: Optional[bool] = None,
+                 invoke_cache_enabled: Optional[bool] = None):
         # Save the metadata information.
         self.project = project
         self.stack = stack
@@ -56,6 +284,13 @@ class Settings:
         self.dry_run = dry_run
         self.test_mode_enabled = test_mode_enabled
         self.legacy_apply_enabled = legacy_apply_enabled
+        self.async_monitor_enabled = async_monitor_enabled
+        self.debug_logging_enabled = debug_logging_enabled
+        self.invoke_cache_enabled = invoke_cache_enabled
+        self.rpc_limiter = RPCLimiter(_rpc_parallelism(parallel))
+        self.invoke_cache = InvokeCache()
+        self.feature_support = {}
+        self.feature_probes = {}
 
         if self.test_mode_enabled is None:
             self.test_mode_enabled = os.getenv("PULUMI_TEST_MODE", "false") == "true"
@@ -63,13 +298,30 @@ class Settings:
         if self.legacy_apply_enabled is None:
             self.legacy_apply_enabled = os.getenv("PULUMI_ENABLE_LEGACY_APPLY", "false") == "true"
 
-        # Actually connect to the monitor/engine over gRPC.
+        if self.async_monitor_enabled is None:
+            self.async_monitor_enabled = os.getenv("PULUMI_ENABLE_ASYNC_MONITOR", "false") == "true"
+
+        # Left unset, debug logging stays off until `negotiate_debug_logging` asks the resource monitor.
+        if self.debug_logging_enabled is None and os.getenv("PULUMI_ENABLE_DEBUG_LOGGING", "false") == "true":
+            self.debug_logging_enabled = True
+
+        if self.invoke_cache_enabled is None:
+            self.invoke_cache_enabled = os.getenv("PULUMI_ENABLE_INVOKE_CACHE", "false") == "true"
+
+        # Actually connect to the monitor/engine over gRPC. The asyncio-native transport is only used when we are
+        # the ones creating the channel; monitors that are handed to us (e.g. mocks) are always treated as blocking.
         if monitor is not None:
             if isinstance(monitor, str):
-                self.monitor = resource_pb2_grpc.ResourceMonitorStub(grpc.insecure_channel(monitor))
+                if self.async_monitor_enabled and grpc_aio is not None:
+                    self.monitor = resource_pb2_grpc.ResourceMonitorStub(grpc_aio.insecure_channel(monitor))
+                else:
+                    self.async_monitor_enabled = False
+                    self.monitor = resource_pb2_grpc.ResourceMonitorStub(grpc.insecure_channel(monitor))
             else:
+                self.async_monitor_enabled = False
                 self.monitor = monitor
         else:
+            self.async_monitor_enabled = False
             self.monitor = None
         if engine:
             if isinstance(engine, str):
@@ -90,6 +342,8 @@ def configure(settings: Settings):
     if not settings or not isinstance(settings, Settings):
         raise TypeError('Settings is expected to be non-None and of type Settings')
     global SETTINGS  # pylint: disable=global-statement
+    if SETTINGS is not settings:
+        SETTINGS.rpc_limiter.shutdown()
     SETTINGS = settings
 
 
@@ -122,6 +376,37 @@ def is_legacy_apply_enabled():
     return bool(SETTINGS.legacy_apply_enabled)
 
 
+def is_async_monitor_enabled() -> bool:
+    """
+    Returns true if the resource monitor is connected over an asyncio-native gRPC channel.
+    """
+    return bool(SETTINGS.async_monitor_enabled)
+
+
+def is_debug_logging_enabled() -> bool:
+    """
+    Returns true if debug messages should be logged. Debug logging is off by default, so debug messages are dropped
+    without being sent to the engine, unless it was turned on when the runtime was configured
+    (PULUMI_ENABLE_DEBUG_LOGGING) or the resource monitor asked for it (see `negotiate_debug_logging`).
+    """
+    return bool(SETTINGS.debug_logging_enabled)
+
+
+def is_invoke_cache_enabled() -> bool:
+    """
+    Returns true if the responses to identical invokes should be shared rather than each invoke being sent to the
+    engine (PULUMI_ENABLE_INVOKE_CACHE).
+    """
+    return bool(SETTINGS.invoke_cache_enabled)
+
+
+def get_invoke_cache() -> InvokeCache:
+    """
+    Returns the cache of invoke responses for the current deployment.
+    """
+    return SETTINGS.invoke_cache
+
+
 def get_project() -> str:
     """
     Returns the current project name.
@@ -175,6 +460,13 @@ def get_engine() -> Optional[Union[engine_pb2_grpc.EngineStub, Any]]:
     return SETTINGS.engine
 
 
+def get_rpc_queue_depth() -> int:
+    """
+    Returns the number of RPCs that are waiting for a slot under the runtime's parallelism limit.
+    """
+    return SETTINGS.rpc_limiter.queued
+
+
 ROOT: Optional['Resource'] = None
 
 
@@ -194,25 +486,112 @@ def set_root_resource(root: 'Resource'):
     ROOT = root
 
 
-async def monitor_supports_secrets() -> bool:
-    monitor = SETTINGS.monitor
+async def run_rpc(do_rpc_call: Callable[[], Any]) -> Any:
+    """
+    Runs a blocking RPC to the engine or resource monitor on the runtime's RPC executor, which bounds the number of
+    RPCs in flight by the engine's requested parallelism.
+    """
+    return await SETTINGS.rpc_limiter.run(do_rpc_call)
+
+
+async def call_monitor(do_rpc_call: Callable[[], Any]) -> Any:
+    """
+    Performs a resource monitor RPC. `do_rpc_call` issues the request against the current monitor. Blocking stubs are
+    run on the RPC executor so that the event loop keeps running while the engine works; asyncio-native stubs hand
+    back an awaitable call, which is awaited directly on the event loop.
+    """
+    if not is_async_monitor_enabled():
+        return await run_rpc(do_rpc_call)
+
+    async def do_async_rpc_call():
+        resp = do_rpc_call()
+        if inspect.isawaitable(resp):
+            return await resp
+        return resp
+
+    try:
+        return await SETTINGS.rpc_limiter.run_async(do_async_rpc_call)
+    except grpc.RpcError as exn:
+        error = _rpc_error(exn)
+    raise error
+
+
+def _rpc_error(exn: grpc.RpcError) -> Exception:
+    """
+    Returns the exception to raise for an RPC to the engine or resource monitor that failed. If the engine is no longer
+    available, the deployment is over, so we exit quietly instead.
+    """
+    # See the comment on invoke for the justification for disabling
+    # this warning
+    # pylint: disable=no-member
+    if exn.code() == grpc.StatusCode.UNAVAILABLE:
+        sys.exit(0)
+    return Exception(exn.details())
+
+
+async def monitor_supports_feature(feature: str) -> bool:
+    """
+    Returns whether the current resource monitor supports the given feature. The monitor is asked at most once per
+    feature: the answer is cached on the current settings, and callers that ask while the request is outstanding
+    share it. Because the cache lives on the settings, it is reset whenever `configure` installs a new monitor.
+    """
+    current = SETTINGS
+    monitor = current.monitor
     if not monitor:
         return False
 
-    req = resource_pb2.SupportsFeatureRequest(id="secrets")
-    def do_rpc_call():
-        try:
-            resp = monitor.SupportsFeature(req)
-            return resp.hasSupport
-        except grpc.RpcError as exn:
-            # See the comment on invoke for the justification for disabling
-            # this warning
-            # pylint: disable=no-member
-            if exn.code() == grpc.StatusCode.UNAVAILABLE:
-                sys.exit(0)
-            if exn.code() == grpc.StatusCode.UNIMPLEMENTED:
-                return False
-            details = exn.details()
-        raise Exception(details)
-
-    return await asyncio.get_event_loop().run_in_executor(None, do_rpc_call)
+    cached = current.feature_support.get(feature)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_event_loop()
+    probe = current.feature_probes.get(feature)
+    if probe is None or probe[0] is not loop:
+        probe = (loop, asyncio.ensure_future(_probe_monitor_feature(current, monitor, feature)))
+        current.feature_probes[feature] = probe
+
+    try:
+        supported = await asyncio.shield(probe[1])
+    except Exception:
+        # Don't cache failures; the next caller will try again.
+        if current.feature_probes.get(feature) is probe:
+            del current.feature_probes[feature]
+        raise
+
+    current.feature_support[feature] = supported
+    return supported
+
+
+async def monitor_supports_secrets() -> bool:
+    return await monitor_supports_feature("secrets")
+
+
+async def negotiate_debug_logging() -> bool:
+    """
+    Decides whether debug messages are sent to the engine, if that wasn't settled when the runtime was configured:
+    they are only sent if the resource monitor supports the "debugLogging" feature, which it reports when the engine
+    is going to show them. Monitors that don't know the feature leave debug logging off.
+    """
+    current = SETTINGS
+    if current.debug_logging_enabled is None:
+        current.debug_logging_enabled = await monitor_supports_feature("debugLogging")
+    return bool(current.debug_logging_enabled)
+
+
+async def _probe_monitor_feature(current: Settings,
+                                 monitor: Union[resource_pb2_grpc.ResourceMonitorStub, Any],
+                                 feature: str) -> bool:
+    # The probe runs against the settings it was started for, even if `configure` has replaced them since.
+    req = resource_pb2.SupportsFeatureRequest(id=feature)
+    try:
+        if current.async_monitor_enabled:
+            resp = await current.rpc_limiter.run_async(lambda: monitor.SupportsFeature(req))
+        else:
+            resp = await current.rpc_limiter.run(lambda: monitor.SupportsFeature(req))
+        return resp.hasSupport
+    except grpc.RpcError as exn:
+        # pylint: disable=no-member
+        if exn.code() == grpc.StatusCode.UNIMPLEMENTED:
+            return False
+        error = _rpc_error(exn)
+    raise error
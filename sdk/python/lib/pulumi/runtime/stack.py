@@ -21,7 +21,9 @@ from inspect import isawaitable
 from typing import Callable, Any, Dict, List
 
 from ..resource import ComponentResource, Resource, ResourceTransformation
-from .settings import get_project, get_stack, get_root_resource, is_dry_run, set_root_resource
+from .settings import get_project, get_stack, get_root_resource, is_dry_run, set_root_resource, get_rpc_queue_depth, \
+    get_invoke_cache, is_invoke_cache_enabled, negotiate_debug_logging
+from .log_sender import LOG_SENDER
 from .rpc_manager import RPC_MANAGER
 from .. import log
 from . import known_types
@@ -34,19 +36,27 @@ async def run_pulumi_func(func: Callable):
     finally:
         log.debug("Waiting for outstanding RPCs to complete")
 
-        # Pump the event loop, giving all of the RPCs that we just queued up time to fully execute.
-        # The asyncio scheduler does not expose a "yield" primitive, so this will have to do.
+        # Pump the event loop, giving all of the RPCs that we just queued up time to start, and then wait for
+        # them to finish. RPCs can start further RPCs as they finish (e.g. a resource's outputs being
+        # registered once the resource is), so once the manager goes idle we yield and check again.
         #
         # Note that "asyncio.sleep(0)" is the blessed way to do this:
         # https://github.com/python/asyncio/issues/284#issuecomment-154180935
-        #
-        # We await each RPC in turn so that this loop will actually block rather than busy-wait.
         while True:
             await asyncio.sleep(0)
-            if len(RPC_MANAGER.rpcs) == 0:
+            if RPC_MANAGER.count == 0:
                 break
-            log.debug(f"waiting for quiescence; {len(RPC_MANAGER.rpcs)} RPCs outstanding")
-            await RPC_MANAGER.rpcs.pop()
+            log.debug(f"waiting for quiescence; {RPC_MANAGER.count} RPCs outstanding, "
+                      f"{get_rpc_queue_depth()} waiting on the parallelism limit")
+            await RPC_MANAGER.wait_for_idle()
+
+        log.debug(f"all RPCs completed; at most {RPC_MANAGER.peak_count} were outstanding at once")
+        if is_invoke_cache_enabled():
+            cache = get_invoke_cache()
+            log.debug(f"invoke cache: {cache.hits} hits, {cache.misses} misses ({cache.hit_rate:.0%} hit rate)")
+
+        # Make sure every message logged so far reaches the engine before we exit.
+        await LOG_SENDER.flush()
 
         # Asyncio event loops require that all outstanding tasks be completed by the time that the
         # event loop closes. If we're at this point and there are no outstanding RPCs, we should
@@ -77,6 +87,7 @@ async def run_in_stack(func: Callable):
     will end up as output properties on the resulting stack component in the checkpoint file.  This
     is meant for internal runtime use only and is used by the Python SDK entrypoint program.
     """
+    await negotiate_debug_logging()
     await run_pulumi_func(lambda: Stack(func))
 
 @known_types.stack
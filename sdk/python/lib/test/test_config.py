@@ -0,0 +1,64 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+import os
+import unittest
+from unittest import mock
+
+from pulumi.config import Config, ConfigTypeError
+from pulumi.runtime import config
+
+
+class ConfigTests(unittest.TestCase):
+    def setUp(self):
+        env_config = json.dumps({
+            "proj:count": "3",
+            "proj:enabled": "true",
+            "proj:tags": '{"a": "b"}',
+        })
+        self.env = mock.patch.dict(os.environ, {"PULUMI_CONFIG": env_config, "PULUMI_CONFIG_PROJ_NAME": "env"})
+        self.env.start()
+        config._env_config = None
+
+    def tearDown(self):
+        self.env.stop()
+        config._env_config = None
+
+    def test_env_config_is_parsed_once(self):
+        cfg = Config("proj")
+        with mock.patch.object(config.json, "loads", wraps=json.loads) as loads:
+            for _ in range(3):
+                self.assertEqual("3", cfg.get("count"))
+                self.assertIsNone(cfg.get("missing"))
+        self.assertEqual(1, loads.call_count)
+        self.assertEqual("env", cfg.get("name"))
+        self.assertEqual("3", config.get_config_env()["proj:count"])
+
+    def test_typed_values(self):
+        cfg = Config("proj")
+        self.assertEqual(3, cfg.get_int("count"))
+        self.assertEqual(3.0, cfg.get_float("count"))
+        self.assertTrue(cfg.get_bool("enabled"))
+        with self.assertRaises(ConfigTypeError):
+            cfg.get_bool("count")
+
+        # Objects aren't shared between callers, so that changing one doesn't affect the others.
+        tags = cfg.get_object("tags")
+        tags["c"] = "d"
+        self.assertDictEqual({"a": "b"}, cfg.get_object("tags"))
+
+        # Values set after they were first read are still picked up.
+        config.set_config("proj:count", "5")
+        self.assertEqual(5, cfg.get_int("count"))
+        del config.CONFIG["proj:count"]
@@ -0,0 +1,210 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+from concurrent import futures
+import hashlib
+import importlib
+import os
+import pickle
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+import grpc
+try:
+    from grpc import aio as grpc_aio
+except ImportError:
+    grpc_aio = None
+
+from pulumi.dynamic import AsyncResourceProvider, CreateResult, ResourceProvider
+from pulumi.dynamic import dynamic
+from pulumi.dynamic import __main__ as provider_main
+from pulumi.runtime import rpc
+from pulumi.runtime.proto import provider_pb2, provider_pb2_grpc
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(coro(*args, **kwargs))
+        loop.close()
+    return wrapper
+
+
+class FakeProvider(ResourceProvider):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    def create(self, props):
+        return CreateResult("id", {"value": self.value})
+
+
+class OnceProvider(FakeProvider):
+    serialize_once = True
+
+
+class FakeAsyncProvider(AsyncResourceProvider):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+    async def create(self, props):
+        await asyncio.sleep(0)
+        return CreateResult("async-id", {"value": self.value})
+
+
+class SerializeProviderTests(unittest.TestCase):
+    def test_serialized_for_every_resource_by_default(self):
+        provider = FakeProvider("a")
+        with mock.patch.object(dynamic, "_serialize_provider", wraps=dynamic._serialize_provider) as serialize:
+            first = dynamic.serialize_provider(provider)
+            second = dynamic.serialize_provider(provider)
+        self.assertEqual(first, second)
+        self.assertEqual(2, serialize.call_count)
+        # The sorted pickler is only in place while a provider is being serialized.
+        self.assertIsNot(pickle.Pickler, pickle._Pickler)
+        self.assertEqual("save_dict", pickle._Pickler.save_dict.__name__)
+
+    def test_nested_changes_are_serialized(self):
+        provider = FakeProvider({"region": "a"})
+        first = dynamic.serialize_provider(provider)
+        provider.value["region"] = "b"
+        second = dynamic.serialize_provider(provider)
+        self.assertNotEqual(first, second)
+        self.assertEqual(dynamic.serialize_provider(FakeProvider({"region": "b"})), second)
+
+    def test_serialized_once_when_opted_in(self):
+        provider = OnceProvider("a")
+        with mock.patch.object(dynamic, "_serialize_provider", wraps=dynamic._serialize_provider) as serialize:
+            first = dynamic.serialize_provider(provider)
+            second = dynamic.serialize_provider(provider)
+            other = dynamic.serialize_provider(OnceProvider("b"))
+        self.assertIs(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(2, serialize.call_count)
+
+    def test_provider_store_is_absolute(self):
+        with mock.patch.dict(os.environ, {"PULUMI_DYNAMIC_PROVIDER_STORE": "store"}):
+            self.assertEqual(os.path.abspath("store"), dynamic._provider_store())
+        with mock.patch.dict(os.environ, {"PULUMI_DYNAMIC_PROVIDER_STORE": ""}):
+            self.assertIsNone(dynamic._provider_store())
+
+    def test_provider_store(self):
+        serialized = dynamic.serialize_provider(FakeProvider("a"))
+        with tempfile.TemporaryDirectory() as store:
+            ref = dynamic._store_provider(serialized, store)
+            self.assertEqual(ref, dynamic._store_provider(serialized, store))
+            self.assertTrue(ref.startswith("sha256:"))
+            self.assertEqual(1, len(os.listdir(store)))
+
+            with mock.patch.dict(os.environ, {"PULUMI_DYNAMIC_PROVIDER_STORE": store}):
+                self.assertEqual(serialized, dynamic._load_provider(ref))
+        self.assertEqual(serialized, dynamic._load_provider(serialized))
+
+
+class GetProviderTests(unittest.TestCase):
+    def setUp(self):
+        provider_main._providers.clear()
+
+    def tearDown(self):
+        provider_main._providers.clear()
+
+    def test_pickled_providers_are_cached(self):
+        serialized = dynamic.serialize_provider(FakeProvider("a"))
+        props = {provider_main.PROVIDER_KEY: serialized}
+        with mock.patch.object(provider_main, "_load_provider", wraps=provider_main._load_provider) as load, \
+                mock.patch.object(provider_main.dill, "loads", wraps=provider_main.dill.loads) as loads:
+            first = provider_main.get_provider(props)
+            second = provider_main.get_provider(props)
+        self.assertEqual((1, 1), (load.call_count, loads.call_count))
+        self.assertListEqual([hashlib.sha256(serialized.encode()).hexdigest()], list(provider_main._providers))
+        # The unpickled provider is shared by every request for its resources.
+        self.assertIs(first, second)
+        self.assertEqual("a", first.value)
+
+    def test_cache_is_bounded(self):
+        serialized = [dynamic.serialize_provider(FakeProvider(value)) for value in ["a", "b", "c"]]
+        with mock.patch.object(provider_main, "_MAX_CACHED_PROVIDERS", 2):
+            for value in [serialized[0], serialized[1], serialized[0], serialized[2]]:
+                provider_main.get_provider({provider_main.PROVIDER_KEY: value})
+        # The least recently used provider is the one that was dropped.
+        expected = [hashlib.sha256(serialized[i].encode()).hexdigest() for i in [0, 2]]
+        self.assertListEqual(expected, list(provider_main._providers))
+
+
+class ExecutorTests(unittest.TestCase):
+    def tearDown(self):
+        importlib.reload(provider_main)
+
+    def test_executor_is_sized_from_parallel(self):
+        with mock.patch.dict(os.environ, {"PULUMI_PARALLEL": "7"}):
+            importlib.reload(provider_main)
+        self.assertEqual(7, provider_main._executor._max_workers)
+
+        with mock.patch.dict(os.environ, {"PULUMI_PARALLEL": "-1"}):
+            importlib.reload(provider_main)
+        self.assertEqual(min(32, (os.cpu_count() or 1) + 4), provider_main._executor._max_workers)
+
+
+@unittest.skipIf(grpc_aio is None, "grpc.aio is not available")
+class ServicerTests(unittest.TestCase):
+    async def create_resources(self, target):
+        async with grpc_aio.insecure_channel(target) as channel:
+            stub = provider_pb2_grpc.ResourceProviderStub(channel)
+            results = []
+            for provider in [FakeProvider("a"), FakeAsyncProvider("b")]:
+                props = await rpc.serialize_properties({provider_main.PROVIDER_KEY: dynamic.serialize_provider(provider)},
+                                                       {})
+                resp = await stub.Create(provider_pb2.CreateRequest(urn="urn", properties=props))
+                results.append((resp.id, rpc.deserialize_properties(resp.properties)["value"]))
+
+            with self.assertRaises(grpc.RpcError) as ctx:
+                await stub.GetSchema(provider_pb2.GetSchemaRequest())
+            self.assertEqual(grpc.StatusCode.UNIMPLEMENTED, ctx.exception.code())
+        return results
+
+    @async_test
+    async def test_asyncio_server(self):
+        server = grpc_aio.server()
+        provider_pb2_grpc.add_ResourceProviderServicer_to_server(provider_main.DynamicResourceProviderServicer(),
+                                                                 server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        await server.start()
+        try:
+            results = await self.create_resources(f"127.0.0.1:{port}")
+        finally:
+            await server.stop(None)
+        self.assertListEqual([("id", "a"), ("async-id", "b")], results)
+
+    def test_blocking_server(self):
+        # Servers without asyncio support call the servicer from their worker threads, which hand each request to an
+        # event loop running in the background.
+        servicer_loop = asyncio.new_event_loop()
+        threading.Thread(target=servicer_loop.run_forever, daemon=True).start()
+        server = grpc.server(futures.ThreadPoolExecutor(max_workers=2))
+        servicer = provider_main._BlockingServicer(provider_main.DynamicResourceProviderServicer(), servicer_loop)
+        provider_pb2_grpc.add_ResourceProviderServicer_to_server(servicer, server)
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.start()
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(self.create_resources(f"127.0.0.1:{port}"))
+        finally:
+            loop.close()
+            server.stop(None)
+            servicer_loop.call_soon_threadsafe(servicer_loop.stop)
+        self.assertListEqual([("id", "a"), ("async-id", "b")], results)
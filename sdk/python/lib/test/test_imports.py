@@ -0,0 +1,65 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import importlib
+import subprocess
+import sys
+import types
+import unittest
+
+from pulumi.runtime import proto
+
+
+def run_imports(statement):
+    """
+    Runs the given statement in a fresh interpreter, returning the names of the modules it left imported.
+    """
+    proc = subprocess.run([sys.executable, "-c", f"{statement}; import sys; print(*sys.modules)"],
+                          stdout=subprocess.PIPE, check=True, universal_newlines=True)
+    return set(proc.stdout.split())
+
+
+@unittest.skipIf(sys.version_info < (3, 7), "imports are only deferred on Python 3.7 and later")
+class ImportTests(unittest.TestCase):
+    def test_cold_start_skips_rarely_used_modules(self):
+        modules = run_imports("import pulumi")
+        # Only the modules needed to talk to the engine and the resource monitor are imported up front.
+        self.assertSetEqual({"pulumi.runtime.proto._members", "pulumi.runtime.proto.engine_pb2",
+                             "pulumi.runtime.proto.engine_pb2_grpc", "pulumi.runtime.proto.plugin_pb2",
+                             "pulumi.runtime.proto.provider_pb2", "pulumi.runtime.proto.resource_pb2",
+                             "pulumi.runtime.proto.resource_pb2_grpc"},
+                            {name for name in modules if name.startswith("pulumi.runtime.proto.")})
+        self.assertSetEqual(set(), {"pulumi.runtime.mocks", "pulumi.stack_reference", "pulumi.dynamic"} & modules)
+
+    def test_deferred_members_are_still_available(self):
+        modules = run_imports("import pulumi, pulumi.runtime, pulumi.runtime.proto as proto; "
+                                 "pulumi.StackReference, pulumi.runtime.Mocks, proto.AnalyzeRequest")
+        self.assertIn("pulumi.stack_reference", modules)
+        self.assertIn("pulumi.runtime.mocks", modules)
+        self.assertIn("pulumi.runtime.proto.analyzer_pb2", modules)
+
+    def test_unknown_names_import_nothing(self):
+        modules = run_imports("import pulumi.runtime.proto as proto; getattr(proto, 'NotAMessage', None)")
+        for name in ["pulumi.runtime.proto.analyzer_pb2", "pulumi.runtime.proto.language_pb2"]:
+            self.assertNotIn(name, modules)
+
+
+class ProtoMembersTests(unittest.TestCase):
+    def test_members_match_generated_modules(self):
+        # The table of lazily imported names is written by sdk/proto/generate.sh, and has to be regenerated whenever
+        # the generated modules change.
+        for module_name, names in proto._MODULE_MEMBERS.items():
+            module = importlib.import_module(f"pulumi.runtime.proto.{module_name}")
+            expected = [name for name in dir(module) if not name.startswith("_") and name != "DESCRIPTOR" and
+                        not isinstance(getattr(module, name), types.ModuleType)]
+            self.assertListEqual(expected, names, module_name)
@@ -0,0 +1,211 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import gc
+import threading
+import time
+import unittest
+
+from google.protobuf import struct_pb2
+
+from pulumi.invoke import InvokeOptions
+from pulumi.runtime import invoke, invoke_async, invoke_batch, rpc_manager, settings
+from pulumi.runtime.proto import provider_pb2
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(coro(*args, **kwargs))
+        loop.close()
+    return wrapper
+
+
+class SlowMonitor:
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = 0
+
+    def Invoke(self, req):
+        with self.lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.delay)
+        with self.lock:
+            self.in_flight -= 1
+
+        ret = struct_pb2.Struct()
+        ret["tok"] = req.tok
+        ret["name"] = req.args["name"]
+        return provider_pb2.InvokeResponse(**{"return": ret})
+
+
+class InvokeTests(unittest.TestCase):
+    def setUp(self):
+        self.old_settings = settings.SETTINGS
+        self.monitor = SlowMonitor(0.1)
+        settings.configure(settings.Settings(monitor=self.monitor, project="project", stack="stack", parallel=4))
+
+    def tearDown(self):
+        settings.configure(self.old_settings)
+
+    @async_test
+    async def test_invoke_async(self):
+        result = await invoke_async("test:index:getThing", {"name": asyncio.sleep(0, "a")})
+        self.assertDictEqual({"tok": "test:index:getThing", "name": "a"}, result)
+
+    @async_test
+    async def test_invoke_batch_runs_concurrently(self):
+        names = [f"thing{i}" for i in range(8)]
+        start = time.perf_counter()
+        results = await invoke_batch([("test:index:getThing", {"name": name}, None) for name in names])
+        elapsed = time.perf_counter() - start
+
+        self.assertListEqual(names, [r["name"] for r in results])
+        # The invokes run concurrently, but never more of them than the runtime's parallelism allows.
+        self.assertEqual(4, self.monitor.max_in_flight)
+        self.assertLess(elapsed, 0.1 * len(names))
+
+    def test_invoke_is_still_synchronous(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            result = invoke("test:index:getThing", {"name": "b"})
+            self.assertDictEqual({"tok": "test:index:getThing", "name": "b"}, result.value)
+        finally:
+            loop.close()
+
+
+class InvokeCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.old_settings = settings.SETTINGS
+        self.monitor = SlowMonitor(0.01)
+        settings.configure(settings.Settings(monitor=self.monitor, project="project", stack="stack",
+                                             invoke_cache_enabled=True))
+
+    def tearDown(self):
+        settings.configure(self.old_settings)
+
+    @async_test
+    async def test_identical_invokes_share_one_rpc(self):
+        results = await invoke_batch([("test:index:getThing", {"name": "a", "region": "r"}, None),
+                                      ("test:index:getThing", {"region": "r", "name": "a"}, None),
+                                      ("test:index:getThing", {"name": "b", "region": "r"}, None)])
+        again = await invoke_async("test:index:getThing", {"name": "a", "region": "r"})
+
+        self.assertListEqual(["a", "a", "b"], [r["name"] for r in results])
+        self.assertEqual("a", again["name"])
+        self.assertEqual(2, self.monitor.calls)
+        cache = settings.get_invoke_cache()
+        self.assertEqual((2, 2), (cache.hits, cache.misses))
+        self.assertEqual(0.5, cache.hit_rate)
+
+    @async_test
+    async def test_invokes_can_opt_out(self):
+        opts = InvokeOptions(cache=False)
+        await invoke_async("test:index:getThing", {"name": "a"})
+        await invoke_async("test:index:getThing", {"name": "a"}, opts)
+        self.assertEqual(2, self.monitor.calls)
+
+    @async_test
+    async def test_cache_is_bounded(self):
+        settings.get_invoke_cache().max_size = 2
+        for name in ["a", "b", "c", "a"]:
+            await invoke_async("test:index:getThing", {"name": name})
+        self.assertEqual(4, self.monitor.calls)
+
+    @async_test
+    async def test_failures_are_not_cached(self):
+        cache = settings.InvokeCache()
+        attempts = []
+
+        async def fail():
+            attempts.append(None)
+            raise Exception("invoke failed")
+
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                await cache.get_or_invoke("key", fail)
+        self.assertEqual(2, len(attempts))
+
+    @async_test
+    async def test_failed_responses_are_not_cached(self):
+        failures = [provider_pb2.CheckFailure(property="name", reason="not yet")]
+        invoke_fn = self.monitor.Invoke
+        self.monitor.Invoke = lambda req: provider_pb2.InvokeResponse(failures=failures)
+
+        with self.assertRaises(Exception):
+            await invoke_async("test:index:getThing", {"name": "a"})
+        # The failure is expected, so don't leave it behind as the deployment's unhandled exception.
+        rpc_manager.RPC_MANAGER.unhandled_exception = None
+        rpc_manager.RPC_MANAGER.exception_traceback = None
+        self.monitor.Invoke = invoke_fn
+        result = await invoke_async("test:index:getThing", {"name": "a"})
+        self.assertEqual("a", result["name"])
+        self.assertEqual(1, self.monitor.calls)
+
+    @async_test
+    async def test_cancelling_the_first_caller_does_not_cancel_the_invoke(self):
+        cache = settings.InvokeCache()
+        release = asyncio.Event()
+        attempts = []
+
+        async def slow():
+            attempts.append(None)
+            await release.wait()
+            return "resp"
+
+        first = asyncio.ensure_future(cache.get_or_invoke("key", slow))
+        second = asyncio.ensure_future(cache.get_or_invoke("key", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        self.assertEqual("resp", await second)
+        self.assertTrue(first.cancelled())
+        self.assertEqual("resp", await cache.get_or_invoke("key", slow))
+        self.assertEqual(1, len(attempts))
+
+    @async_test
+    async def test_evicted_failures_are_retrieved(self):
+        cache = settings.InvokeCache(max_size=1)
+        release = asyncio.Event()
+        reported = []
+        asyncio.get_event_loop().set_exception_handler(lambda loop, context: reported.append(context))
+
+        async def fail():
+            await release.wait()
+            raise Exception("invoke failed")
+
+        async def succeed():
+            return "resp"
+
+        # The only caller of the failing invoke goes away, and the invoke is evicted before it fails.
+        caller = asyncio.ensure_future(cache.get_or_invoke("failing", fail))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await cache.get_or_invoke("other", succeed)
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        del caller
+        gc.collect()
+        self.assertListEqual([], reported)
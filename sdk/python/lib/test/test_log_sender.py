@@ -0,0 +1,122 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import threading
+import unittest
+
+from pulumi.output import Output
+from pulumi.runtime.log_sender import LogSender
+from pulumi.runtime.proto import engine_pb2
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(coro(*args, **kwargs))
+        loop.close()
+    return wrapper
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.logs = []
+        self.threads = set()
+
+    def Log(self, request):
+        self.threads.add(threading.current_thread())
+        self.logs.append((request.message, request.urn, request.streamId))
+
+
+class FakeResource:
+    def __init__(self):
+        self.urn_future = asyncio.Future()
+        self.urn = Output.from_input(self.urn_future)
+
+
+class LogSenderTests(unittest.TestCase):
+    @async_test
+    async def test_sends_off_the_calling_thread(self):
+        engine = RecordingEngine()
+        sender = LogSender()
+        sender.log(engine, engine_pb2.INFO, "a", None, 0)
+        sender.log(engine, engine_pb2.INFO, "b", None, 0)
+        await sender.flush()
+        self.assertListEqual([("a", "", 0), ("b", "", 0)], engine.logs)
+        self.assertNotIn(threading.current_thread(), engine.threads)
+
+    @async_test
+    async def test_stream_order_waits_for_urns(self):
+        engine = RecordingEngine()
+        sender = LogSender()
+        res = FakeResource()
+        sender.log(engine, engine_pb2.INFO, "first ", res, 7)
+        sender.log(engine, engine_pb2.INFO, "second", None, 7)
+        sender.log(engine, engine_pb2.INFO, "unrelated", None, 0)
+        await asyncio.sleep(0)
+
+        res.urn_future.set_result("urn:a")
+        await sender.flush()
+        # Messages without a stream don't wait for others, while the stream's messages keep their order.
+        self.assertEqual(("unrelated", "", 0), engine.logs[0])
+        self.assertListEqual(["first ", "second"], [m for m, _, s in engine.logs if s == 7])
+        self.assertIn(("first ", "urn:a", 7), engine.logs)
+
+    def test_coalesces_stream_chunks(self):
+        engine = RecordingEngine()
+        sender = LogSender()
+        block = threading.Event()
+        blocking_engine = RecordingEngine()
+        blocking_engine.Log = lambda _req: block.wait()
+
+        # Hold up the sender so that the chunks queue up behind the first message.
+        sender.log(blocking_engine, engine_pb2.INFO, "hold", None, 0)
+        for chunk in ["a", "b", "c"]:
+            sender.log(engine, engine_pb2.INFO, chunk, None, 3)
+        sender.log(engine, engine_pb2.INFO, "d", None, 0)
+        block.set()
+        sender.flush_sync()
+        self.assertListEqual([("abc", "", 3), ("d", "", 0)], engine.logs)
+
+    @async_test
+    async def test_flush_sends_messages_for_unregistered_resources(self):
+        engine = RecordingEngine()
+        sender = LogSender()
+        res = FakeResource()
+        res.urn_future.set_exception(Exception("registration failed"))
+        sender.log(engine, engine_pb2.WARNING, "still sent", res, 0)
+        await sender.flush()
+        self.assertListEqual([("still sent", "", 0)], engine.logs)
+
+    def test_logging_never_blocks(self):
+        engine = RecordingEngine()
+        sender = LogSender(max_queued=2)
+        sending, block = threading.Event(), threading.Event()
+        self.addCleanup(block.set)
+        blocking_engine = RecordingEngine()
+        blocking_engine.Log = lambda _req: sending.set() or block.wait()
+
+        # With the engine stalled, logging well past the queue's limit still returns right away. Chunks of a stream
+        # are merged into the last queued message, and nothing is dropped.
+        sender.log(blocking_engine, engine_pb2.INFO, "hold", None, 0)
+        sending.wait()
+        for i in range(100):
+            sender.log(engine, engine_pb2.INFO, f"{i} ", None, 0)
+        for chunk in ["a", "b", "c", "d"]:
+            sender.log(engine, engine_pb2.INFO, chunk, None, 5)
+        self.assertEqual(101, len(sender._queue))
+        block.set()
+        sender.flush_sync()
+        self.assertEqual([f"{i} " for i in range(100)], [m for m, _, s in engine.logs if s == 0])
+        self.assertEqual(("abcd", "", 5), engine.logs[-1])
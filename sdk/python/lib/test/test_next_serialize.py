@@ -12,7 +12,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import asyncio
+import gc
 import unittest
+import weakref
 
 from google.protobuf import struct_pb2
 from pulumi.resource import CustomResource
@@ -82,6 +84,18 @@ class NextSerializationTests(unittest.TestCase):
         prop = await rpc.serialize_property(test_dict, [])
         self.assertDictEqual({"a": 42, "b": 99}, prop)
 
+    @async_test
+    async def test_plain_values_are_copied_and_translated(self):
+        fut = asyncio.Future()
+        fut.set_result("b")
+        value = {"outer_key": [{"inner_key": 1}, None, True, 2.5], "mixed_key": [fut, {"plain_key": "c"}]}
+        prop = await rpc.serialize_property(value, [], lambda k: k.upper())
+        self.assertDictEqual({
+            "OUTER_KEY": [{"INNER_KEY": 1}, None, True, 2.5],
+            "MIXED_KEY": ["b", {"PLAIN_KEY": "c"}],
+        }, prop)
+        self.assertIsNot(value["outer_key"], prop["OUTER_KEY"])
+
     @async_test
     async def test_custom_resource(self):
         res = FakeCustomResource("some-id")
@@ -148,6 +162,35 @@ class NextSerializationTests(unittest.TestCase):
         # If the caller of future() explicitly accepts first-class unknowns, they should be present in the result.
         self.assertEqual(UNKNOWN, await out.future(with_unknowns=True))
 
+    @async_test
+    async def test_prompt_output_allocates_no_tasks(self):
+        loop = asyncio.get_event_loop()
+        tasks = asyncio.all_tasks(loop)
+        out = Output.all(Output.from_input(3), Output.secret("s"))
+        self.assertSetEqual(tasks, asyncio.all_tasks(loop))
+
+        self.assertEqual([3, "s"], await out.future())
+        self.assertTrue(await out.is_known())
+        self.assertTrue(await out.is_secret())
+
+    @async_test
+    async def test_failed_apply(self):
+        res = FakeCustomResource("some-resource")
+        fut = asyncio.Future()
+        fut.set_result(42)
+        known_fut = asyncio.Future()
+        known_fut.set_result(True)
+        out = Output({res}, fut, known_fut).apply(lambda v: v / 0)
+
+        # Only the value of the output is unavailable.
+        self.assertSetEqual({res}, await out.resources())
+        self.assertFalse(await out.is_known())
+        self.assertFalse(await out.is_secret())
+        with self.assertRaises(ZeroDivisionError):
+            await out.future()
+        with self.assertRaises(ZeroDivisionError):
+            await out.apply(lambda v: v).future()
+
     @async_test
     async def test_output_all(self):
         res = FakeCustomResource("some-resource")
@@ -392,6 +435,68 @@ class NextSerializationTests(unittest.TestCase):
         self.assertEqual(42, await out.future())
         self.assertEqual(42, await out.apply(lambda v: v).future())
 
+    @async_test
+    async def test_apply_resolved_output(self):
+        seen = []
+        out = Output.from_input(21).apply(lambda v: seen.append(v) or Output.secret(v * 2))
+
+        # Even though the source is already resolved, the callback runs later rather than during the call to apply.
+        self.assertListEqual([], seen)
+        self.assertEqual(42, await out.future())
+        self.assertListEqual([21], seen)
+        self.assertTrue(await out.is_secret())
+
+        # Exceptions raised by the callback don't escape apply, but surface from the result.
+        failed = out.apply(lambda v: v / 0)
+        with self.assertRaises(ZeroDivisionError):
+            await failed.future()
+
+    @async_test
+    async def test_siblings_serialize_concurrently(self):
+        # The first sibling can only resolve once the second has been serialized, so this deadlocks unless siblings
+        # are serialized concurrently. Dependencies must still be reported in sibling order.
+        first_res = FakeCustomResource("first")
+        second_res = FakeCustomResource("second")
+        second_seen = asyncio.Event()
+
+        async def first():
+            await second_seen.wait()
+            return 1
+
+        async def second():
+            second_seen.set()
+            return 2
+
+        def output(res, coro):
+            known_fut = asyncio.Future()
+            known_fut.set_result(True)
+            return Output({res}, coro, known_fut)
+
+        deps = []
+        prop = await rpc.serialize_property([output(first_res, first()), output(second_res, second())], deps)
+        self.assertListEqual([1, 2], prop)
+        self.assertListEqual([first_res, second_res], deps)
+
+        second_seen.clear()
+        property_deps = {}
+        struct = await rpc.serialize_properties({
+            "b": output(first_res, first()),
+            "a": output(second_res, second()),
+        }, property_deps)
+        self.assertEqual(2, struct["a"])
+        self.assertListEqual(["b", "a"], list(property_deps.keys()))
+        self.assertListEqual([first_res], property_deps["b"])
+        self.assertListEqual([second_res], property_deps["a"])
+
+    def test_contains_unknowns(self):
+        shared = {"a": [1, 2, 3]}
+        cyclic = [shared, shared]
+        cyclic.append(cyclic)
+        self.assertFalse(rpc.contains_unknowns(cyclic))
+
+        cyclic.append({"b": [UNKNOWN]})
+        self.assertTrue(rpc.contains_unknowns(cyclic))
+
 
 class DeserializationTests(unittest.TestCase):
     def test_unsupported_sig(self):
@@ -439,3 +544,137 @@ class DeserializationTests(unittest.TestCase):
         self.assertEqual(val["listWithMap"][rpc._special_sig_key], rpc._special_secret_sig)
         self.assertEqual(val["listWithMap"]["value"][0]["regular"], "a normal value")
         self.assertEqual(val["listWithMap"]["value"][0]["secret"], "a secret value")
+
+    def test_nested_secret_is_wrapped_once(self):
+        secret_value = {rpc._special_sig_key: rpc._special_secret_sig, "value": "a secret value" }
+        all_props = struct_pb2.Struct()
+        all_props["secretList"] = {rpc._special_sig_key: rpc._special_secret_sig, "value": ["a", secret_value]}
+
+        val = rpc.deserialize_properties(all_props)
+        self.assertEqual(val["secretList"][rpc._special_sig_key], rpc._special_secret_sig)
+        self.assertListEqual(["a", "a secret value"], val["secretList"]["value"])
+
+    def test_deeply_nested_value(self):
+        depth = 5000
+        all_props = struct_pb2.Struct()
+        value = all_props.get_or_create_list("deep")
+        for _ in range(depth - 1):
+            value = value.add_list()
+        value.append("leaf")
+
+        val = rpc.deserialize_properties(all_props)["deep"]
+        for _ in range(depth):
+            self.assertIsInstance(val, list)
+            val = val[0]
+        self.assertEqual("leaf", val)
+
+
+class FakeTranslatingResource:
+    """
+    Fake Resource class that duck-types to a resource that translates the names of its output properties.
+    """
+    def translate_output_property(self, prop: str) -> str:
+        return {"engineProp": "engine_prop", "nestedKey": "nested_key", "value": "translated_value"}.get(prop, prop)
+
+
+class ResolveOutputsTests(unittest.TestCase):
+    def setUp(self):
+        self.old_dry_run = settings.SETTINGS.dry_run
+        settings.SETTINGS.dry_run = False
+
+    def tearDown(self):
+        settings.SETTINGS.dry_run = self.old_dry_run
+
+    @async_test
+    async def test_translates_output_names(self):
+        secret_value = {rpc._special_sig_key: rpc._special_secret_sig, "value": {"nestedKey": "a secret value"}}
+        outputs = struct_pb2.Struct()
+        outputs["engineProp"] = {"nestedKey": [{"nestedKey": 42}]}
+        outputs["value"] = secret_value
+        inputs = struct_pb2.Struct()
+        inputs["engineProp"] = "an input value"
+        inputs["inputProp"] = {"nestedKey": "another input value"}
+
+        resolved = {}
+        def resolver(name):
+            def resolve(value, is_known, is_secret, _exn):
+                resolved[name] = (value, is_known, is_secret)
+            return resolve
+
+        names = ["engine_prop", "translated_value", "inputProp"]
+        await rpc.resolve_outputs(FakeTranslatingResource(), inputs, outputs, {k: resolver(k) for k in names})
+
+        self.assertEqual(({"nested_key": [{"nested_key": 42}]}, True, False), resolved["engine_prop"])
+        self.assertEqual(({"nested_key": "a secret value"}, True, True), resolved["translated_value"])
+        self.assertEqual(({"nested_key": "another input value"}, True, False), resolved["inputProp"])
+
+
+class TableTranslatingResource(CustomResource):
+    _input_property_names = {"input_prop": "inputProp", "nested_key": "nestedKey"}
+    _output_property_names = {"outputProp": "output_prop", "nestedKey": "nested_key"}
+
+
+class OverridingResource(TableTranslatingResource):
+    def translate_input_property(self, prop: str) -> str:
+        return prop.upper()
+
+
+class PropertyNameTranslationTests(unittest.TestCase):
+    def test_static_tables(self):
+        res = object.__new__(TableTranslatingResource)
+        self.assertEqual("inputProp", res.translate_input_property("input_prop"))
+        self.assertEqual("other", res.translate_input_property("other"))
+        self.assertEqual("output_prop", res.translate_output_property("outputProp"))
+        self.assertEqual({"output_prop": [{"nested_key": 1}]},
+                         rpc.translate_output_properties(res, {"outputProp": [{"nestedKey": 1}]}))
+
+    def test_translator_memoizes_per_class(self):
+        calls = []
+        class CountingResource(CustomResource):
+            _translations_are_static = True
+
+            def translate_input_property(self, prop: str) -> str:
+                calls.append(prop)
+                return prop + "_"
+
+        translate = rpc.input_name_translator(object.__new__(CountingResource))
+        self.assertEqual("a_", translate("a"))
+        self.assertEqual("a_", rpc.input_name_translator(object.__new__(CountingResource))("a"))
+        self.assertListEqual(["a"], calls)
+
+        # Resources that don't translate their names don't need a translator at all.
+        self.assertIsNone(rpc.input_name_translator(object.__new__(CustomResource)))
+        self.assertIsNone(rpc.output_name_translator(object.__new__(CustomResource)))
+
+    def test_overrides_are_not_memoized_by_default(self):
+        class PrefixingResource(CustomResource):
+            def __init__(self, prefix): # pylint: disable=super-init-not-called
+                self.prefix = prefix
+
+            def translate_output_property(self, prop: str) -> str:
+                return self.prefix + prop
+
+        self.assertEqual("a_x", rpc.output_name_translator(PrefixingResource("a_"))("x"))
+        self.assertEqual("b_x", rpc.output_name_translator(PrefixingResource("b_"))("x"))
+
+    def test_memo_does_not_keep_classes_alive(self):
+        class TemporaryResource(CustomResource):
+            _input_property_names = {"a": "b"}
+
+        self.assertEqual("b", rpc.input_name_translator(object.__new__(TemporaryResource))("a"))
+        ref = weakref.ref(TemporaryResource)
+        del TemporaryResource
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def test_overridden_method_wins_over_table(self):
+        translate = rpc.input_name_translator(object.__new__(OverridingResource))
+        self.assertEqual("INPUT_PROP", translate("input_prop"))
+
+    @async_test
+    async def test_serialize_with_translator(self):
+        translate = rpc.input_name_translator(object.__new__(TableTranslatingResource))
+        deps = {}
+        struct = await rpc.serialize_properties({"input_prop": {"nested_key": 1}, "other": 2}, deps, translate)
+        self.assertEqual({"inputProp": {"nestedKey": 1}, "other": 2}, rpc.deserialize_properties(struct))
+        self.assertListEqual(["inputProp", "other"], sorted(deps.keys()))
@@ -0,0 +1,149 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import unittest
+
+from pulumi.output import Output, UNKNOWN
+from pulumi.resource import ProviderResource, Resource, ResourceOptions
+from pulumi.runtime import settings
+from pulumi.runtime.log_sender import LOG_SENDER
+from pulumi.runtime.resource import prepare_resource
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(coro(*args, **kwargs))
+        loop.close()
+    return wrapper
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.logs = []
+
+    def Log(self, request):
+        self.logs.append(request.message)
+
+
+class FakeUrn:
+    def __init__(self):
+        self.requests = 0
+        self.value = asyncio.Future()
+
+    def future(self):
+        self.requests += 1
+        return self.value
+
+
+class FakeResource:
+    _input_property_names = None
+    _urn_future = None
+    _ref_future = None
+    translate_input_property = Resource.translate_input_property
+    _resolved_urn = Resource._resolved_urn
+    _resolved_provider_ref = ProviderResource._resolved_provider_ref
+
+    def __init__(self):
+        self.urn = FakeUrn()
+        self.id = Output.from_input("id")
+        self._aliases = []
+
+
+def depends_on(value, *resources):
+    return Output(set(resources), asyncio.ensure_future(asyncio.sleep(0, value)),
+                  asyncio.ensure_future(asyncio.sleep(0, True)))
+
+
+class PrepareResourceTests(unittest.TestCase):
+    def setUp(self):
+        self.old_settings = settings.SETTINGS
+        settings.configure(settings.Settings(project="project", stack="stack"))
+        settings.set_root_resource(None)
+
+    def tearDown(self):
+        settings.configure(self.old_settings)
+
+    @async_test
+    async def test_waits_concurrently_and_once_per_resource(self):
+        res = FakeResource()
+        parent, provider, other = FakeResource(), FakeResource(), FakeResource()
+        res._aliases = [asyncio.ensure_future(asyncio.sleep(0, "urn:alias")), "urn:alias"]
+        opts = ResourceOptions(parent=parent, provider=provider)
+        opts.depends_on = [parent, other]
+        props = {"a": depends_on(1, parent), "b": depends_on(2, other, parent)}
+
+        task = asyncio.ensure_future(prepare_resource(res, "test:index:Res", True, props, opts))
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        # Nothing has resolved yet, but every resource is already being waited for, each of them once.
+        self.assertFalse(task.done())
+        self.assertListEqual([1, 1, 1], [parent.urn.requests, provider.urn.requests, other.urn.requests])
+
+        # Resolve the URNs in the opposite order to the one prepare_resource used to wait for them in.
+        for r, urn in [(other, "urn:other"), (provider, "urn:provider"), (parent, "urn:parent")]:
+            r.urn.value.set_result(urn)
+        resolver = await task
+
+        self.assertListEqual([1, 1, 1], [parent.urn.requests, provider.urn.requests, other.urn.requests])
+        self.assertEqual("urn:parent", resolver.parent_urn)
+        self.assertEqual("urn:provider::id", resolver.provider_ref)
+        self.assertSetEqual({"urn:parent", "urn:other"}, resolver.dependencies)
+        self.assertListEqual(["urn:parent"], resolver.property_dependencies["a"])
+        self.assertSetEqual({"urn:parent", "urn:other"}, set(resolver.property_dependencies["b"]))
+        self.assertListEqual(["urn:alias"], resolver.aliases)
+        self.assertDictEqual({"a": 1, "b": 2}, dict(resolver.serialized_props.items()))
+        self.assertSetEqual({"properties", "dependencies", "parent", "provider", "aliases", "property_dependencies"},
+                            set(resolver.stage_timings))
+
+    @async_test
+    async def test_debug_message_reports_stage_timings(self):
+        engine = RecordingEngine()
+        settings.configure(settings.Settings(project="project", stack="stack", engine=engine,
+                                             debug_logging_enabled=True))
+        await prepare_resource(FakeResource(), "test:index:Res", True, {"a": 1}, None)
+        LOG_SENDER.flush_sync()
+
+        prepared = [message for message in engine.logs if " prepared (" in message]
+        self.assertEqual(1, len(prepared))
+        for stage in ["properties", "dependencies", "parent", "provider", "aliases", "property_dependencies"]:
+            self.assertRegex(prepared[0], rf"\b{stage} \d+\.\dms")
+
+    @async_test
+    async def test_urn_and_provider_ref_are_shared(self):
+        provider = FakeResource()
+        children = [FakeResource() for _ in range(10)]
+        opts = ResourceOptions(parent=provider, provider=provider)
+        tasks = [asyncio.ensure_future(prepare_resource(child, "test:index:Res", True, {}, opts)) for child in children]
+        await asyncio.sleep(0)
+
+        provider.urn.value.set_result("urn:provider")
+        resolvers = await asyncio.gather(*tasks)
+
+        self.assertListEqual(["urn:provider::id"] * 10, [r.provider_ref for r in resolvers])
+        self.assertEqual(1, provider.urn.requests)
+        self.assertIs(provider._resolved_provider_ref(), provider._resolved_provider_ref())
+
+    @async_test
+    async def test_resolved_output_future_is_shared(self):
+        known = Output.from_input("a")
+        self.assertIs(known.future(), known.future())
+        self.assertEqual("a", await known.future())
+
+        # Values with unknowns are hidden unless asked for, so those futures aren't shared.
+        unknown = Output.from_input(Output.from_input([1, UNKNOWN]))
+        self.assertIsNot(unknown.future(), unknown.future())
+        self.assertIsNone(await unknown.future())
@@ -0,0 +1,65 @@
+# Copyright 2016-2020, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import unittest
+
+from pulumi.runtime.rpc_manager import RPCManager
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(coro(*args, **kwargs))
+        loop.close()
+    return wrapper
+
+
+class RPCManagerTests(unittest.TestCase):
+    @async_test
+    async def test_tracks_outstanding_rpcs(self):
+        manager = RPCManager()
+        release = asyncio.Event()
+
+        async def rpc(value):
+            await release.wait()
+            return value
+
+        tasks = [asyncio.ensure_future(manager.do_rpc("test", rpc)(i)) for i in range(3)]
+        await asyncio.sleep(0)
+        self.assertEqual(3, manager.count)
+
+        idle = asyncio.ensure_future(manager.wait_for_idle())
+        await asyncio.sleep(0)
+        self.assertFalse(idle.done())
+
+        release.set()
+        await idle
+        self.assertEqual(0, manager.count)
+        self.assertEqual(3, manager.peak_count)
+        self.assertListEqual([(0, None), (1, None), (2, None)], [t.result() for t in tasks])
+
+        # Once idle, waiting returns immediately.
+        await manager.wait_for_idle()
+
+    @async_test
+    async def test_records_first_exception(self):
+        manager = RPCManager()
+
+        async def rpc(msg):
+            raise Exception(msg)
+
+        _, first = await manager.do_rpc("test", rpc)("first")
+        await manager.do_rpc("test", rpc)("second")
+        self.assertIs(first, manager.unhandled_exception)
+        self.assertEqual(0, manager.count)
@@ -0,0 +1,277 @@
+# Copyright 2016-2018, Pulumi Corporation.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import asyncio
+import threading
+import unittest
+
+import grpc
+from pulumi import log
+from pulumi.runtime import settings
+from pulumi.runtime.log_sender import LOG_SENDER
+from pulumi.runtime.proto import engine_pb2, resource_pb2
+
+
+def async_test(coro):
+    def wrapper(*args, **kwargs):
+        loop = asyncio.new_event_loop()
+        loop.run_until_complete(coro(*args, **kwargs))
+        loop.close()
+    return wrapper
+
+
+class CallMonitorTests(unittest.TestCase):
+    def setUp(self):
+        self.old_settings = settings.SETTINGS
+        settings.configure(settings.Settings())
+
+    def tearDown(self):
+        settings.configure(self.old_settings)
+
+    @async_test
+    async def test_blocking_monitor_runs_off_loop(self):
+        loop_thread = threading.current_thread()
+
+        def do_rpc_call():
+            return threading.current_thread()
+
+        rpc_thread = await settings.call_monitor(do_rpc_call)
+        self.assertIsNot(loop_thread, rpc_thread)
+
+    @async_test
+    async def test_async_monitor_awaits_on_loop(self):
+        settings.SETTINGS.async_monitor_enabled = True
+        loop_thread = threading.current_thread()
+
+        async def rpc():
+            return threading.current_thread()
+
+        rpc_thread = await settings.call_monitor(rpc)
+        self.assertIs(loop_thread, rpc_thread)
+
+    def test_async_monitor_requires_address(self):
+        s = settings.Settings(monitor=object(), async_monitor_enabled=True)
+        self.assertFalse(s.async_monitor_enabled)
+
+
+class RPCLimiterTests(unittest.TestCase):
+    def test_parallelism_from_settings(self):
+        self.assertEqual(4, settings.Settings(parallel=4).rpc_limiter.limit)
+        self.assertEqual(4, settings.Settings(parallel="4").rpc_limiter.limit)
+        self.assertEqual(settings._MAX_RPC_PARALLELISM, settings.Settings(parallel=2147483647).rpc_limiter.limit)
+        self.assertLess(0, settings.Settings().rpc_limiter.limit)
+
+    @async_test
+    async def test_blocking_rpcs_are_bounded(self):
+        limiter = settings.RPCLimiter(2)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+        release = threading.Event()
+
+        def do_rpc_call():
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            release.wait()
+            with lock:
+                running[0] -= 1
+
+        rpcs = asyncio.gather(*[limiter.run(do_rpc_call) for _ in range(5)])
+        while limiter.in_flight < 2:
+            await asyncio.sleep(0.01)
+        self.assertEqual(3, limiter.queued)
+        release.set()
+        await rpcs
+        self.assertEqual(2, peak[0])
+        self.assertEqual(0, limiter.queued)
+        self.assertEqual(0, limiter.in_flight)
+
+    @async_test
+    async def test_configure_shuts_down_replaced_limiter(self):
+        old_settings = settings.SETTINGS
+        try:
+            first = settings.Settings()
+            settings.configure(first)
+            await settings.run_rpc(lambda: None)
+            executor = first.rpc_limiter._executor
+
+            settings.configure(settings.Settings())
+            self.assertIsNone(first.rpc_limiter._executor)
+            with self.assertRaises(RuntimeError):
+                executor.submit(lambda: None)
+
+            # The replaced settings can still be used again if they're reinstated.
+            settings.configure(first)
+            self.assertEqual(2, await settings.run_rpc(lambda: 2))
+        finally:
+            settings.configure(old_settings)
+
+    @async_test
+    async def test_async_rpcs_are_bounded(self):
+        limiter = settings.RPCLimiter(2)
+        running = [0]
+        peak = [0]
+
+        async def do_rpc_call():
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+            await asyncio.sleep(0.01)
+            running[0] -= 1
+
+        await asyncio.gather(*[limiter.run_async(do_rpc_call) for _ in range(5)])
+        self.assertEqual(2, peak[0])
+        self.assertEqual(0, limiter.queued)
+
+
+class CountingMonitor:
+    def __init__(self, features=("secrets",)):
+        self.features = features
+        self.probes = 0
+
+    def SupportsFeature(self, request):
+        self.probes += 1
+        return resource_pb2.SupportsFeatureResponse(hasSupport=request.id in self.features)
+
+
+class BlockedMonitor(CountingMonitor):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def SupportsFeature(self, request):
+        self.release.wait()
+        return super().SupportsFeature(request)
+
+
+class UnimplementedError(grpc.RpcError):
+    def code(self):
+        return grpc.StatusCode.UNIMPLEMENTED
+
+
+class OldMonitor:
+    def SupportsFeature(self, request):
+        raise UnimplementedError()
+
+
+class FeatureSupportTests(unittest.TestCase):
+    def setUp(self):
+        self.old_settings = settings.SETTINGS
+
+    def tearDown(self):
+        settings.configure(self.old_settings)
+
+    @async_test
+    async def test_feature_support_is_cached(self):
+        monitor = CountingMonitor()
+        settings.configure(settings.Settings(monitor=monitor))
+
+        results = await asyncio.gather(*[settings.monitor_supports_secrets() for _ in range(10)])
+        self.assertTrue(all(results))
+        self.assertFalse(await settings.monitor_supports_feature("unknownFeature"))
+        self.assertTrue(await settings.monitor_supports_secrets())
+        self.assertEqual(2, monitor.probes)
+
+    @async_test
+    async def test_probe_outlives_configure(self):
+        monitor = BlockedMonitor()
+        first = settings.Settings(monitor=monitor)
+        settings.configure(first)
+        probe = asyncio.ensure_future(settings.monitor_supports_secrets())
+        while first.rpc_limiter.in_flight < 1:
+            await asyncio.sleep(0.01)
+
+        second = settings.Settings(monitor=CountingMonitor())
+        settings.configure(second)
+        monitor.release.set()
+        self.assertTrue(await probe)
+
+        # The probe ran on the settings it was started for, and its answer was cached there.
+        self.assertEqual(0, second.rpc_limiter.in_flight)
+        self.assertDictEqual({"secrets": True}, first.feature_support)
+        self.assertDictEqual({}, second.feature_support)
+
+    @async_test
+    async def test_unimplemented_feature_probe(self):
+        settings.configure(settings.Settings(monitor=OldMonitor()))
+        self.assertFalse(await settings.monitor_supports_secrets())
+
+    @async_test
+    async def test_configure_resets_feature_support(self):
+        monitor = CountingMonitor()
+        settings.configure(settings.Settings(monitor=monitor))
+        self.assertTrue(await settings.monitor_supports_secrets())
+
+        settings.configure(settings.Settings(monitor=monitor))
+        self.assertTrue(await settings.monitor_supports_secrets())
+        self.assertEqual(2, monitor.probes)
+
+
+class RecordingEngine:
+    def __init__(self):
+        self.logs = []
+
+    def Log(self, request):
+        self.logs.append((request.severity, request.message))
+
+
+class DebugLoggingTests(unittest.TestCase):
+    def setUp(self):
+        self.old_settings = settings.SETTINGS
+
+    def tearDown(self):
+        settings.configure(self.old_settings)
+
+    def test_debug_logging_disabled_by_default(self):
+        engine = RecordingEngine()
+        settings.configure(settings.Settings(engine=engine))
+        self.assertFalse(settings.is_debug_logging_enabled())
+        log.debug("a debug message")
+        LOG_SENDER.flush_sync()
+        self.assertListEqual([], engine.logs)
+
+    @async_test
+    async def test_monitor_without_feature_sends_no_debug_messages(self):
+        engine = RecordingEngine()
+        monitor = CountingMonitor()
+        settings.configure(settings.Settings(monitor=monitor, engine=engine))
+        self.assertFalse(await settings.negotiate_debug_logging())
+        log.debug("a debug message")
+        LOG_SENDER.flush_sync()
+        self.assertListEqual([], engine.logs)
+        self.assertEqual(1, monitor.probes)
+
+    @async_test
+    async def test_monitor_can_ask_for_debug_messages(self):
+        engine = RecordingEngine()
+        settings.configure(settings.Settings(monitor=CountingMonitor(features=("debugLogging",)), engine=engine))
+        self.assertTrue(await settings.negotiate_debug_logging())
+        log.debug("a debug message")
+        LOG_SENDER.flush_sync()
+        self.assertListEqual([(engine_pb2.DEBUG, "a debug message")], engine.logs)
+
+    @async_test
+    async def test_explicit_setting_is_not_negotiated(self):
+        monitor = CountingMonitor(features=("debugLogging",))
+        settings.configure(settings.Settings(monitor=monitor, debug_logging_enabled=False))
+        self.assertFalse(await settings.negotiate_debug_logging())
+        self.assertEqual(0, monitor.probes)
+
+    def test_debug_logging_disabled(self):
+        engine = RecordingEngine()
+        settings.configure(settings.Settings(engine=engine, debug_logging_enabled=False))
+        self.assertFalse(settings.is_debug_logging_enabled())
+        log.debug("a debug message")
+        log.info("an info message")
+        LOG_SENDER.flush_sync()
+        self.assertListEqual([(engine_pb2.INFO, "an info message")], engine.logs)